@@ -1,4 +1,4 @@
 """Configuration module."""
-from .settings import settings, get_settings, Settings
+from .settings import settings, get_settings, Settings, configure_logging
 
-__all__ = ["settings", "get_settings", "Settings"]
+__all__ = ["settings", "get_settings", "Settings", "configure_logging"]
@@ -1,11 +1,13 @@
 """
 Configuration settings for the Logistics AI Control System.
 """
+import logging
 import os
 from pathlib import Path
 from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
+import structlog
 
 
 class Settings(BaseSettings):
@@ -104,3 +106,18 @@ settings = Settings()
 def get_settings() -> Settings:
     """Get the global settings instance."""
     return settings
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Configure structlog to drop messages below LOG_LEVEL.
+
+    Loggers are filtering bound loggers, so calls below the level return
+    before any processor runs.
+    """
+    level_name = (level or settings.LOG_LEVEL).upper()
+    min_level = logging.getLevelNamesMapping().get(level_name, logging.INFO)
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(min_level),
+        cache_logger_on_first_use=True,
+    )
@@ -58,7 +58,11 @@ async def debug_allocation():
     else:
         print("❌ Delivery location not set")
     
-    # Test AI analysis
+    # Test truck allocation
+    print("\n🚛 Testing truck allocation...")
+    await request_processor._allocate_truck(test_request)
+    
+    # Test AI analysis (also explains the allocation)
     print("\n🤖 Testing AI analysis...")
     await request_processor._analyze_request_with_ai(test_request)
     
@@ -67,10 +71,6 @@ async def debug_allocation():
     else:
         print("❌ AI analysis failed")
     
-    # Test truck allocation
-    print("\n🚛 Testing truck allocation...")
-    await request_processor._allocate_truck(test_request)
-    
     if test_request.assigned_truck_id:
         print(f"✅ Truck allocated: {test_request.assigned_truck_id}")
         print(f"   Reasoning: {test_request.allocation_reasoning}")
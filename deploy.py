@@ -57,7 +57,7 @@ def create_deployment_files():
             "builder": "NIXPACKS"
         },
         "deploy": {
-            "startCommand": "pip install -r requirements.txt && uvicorn src.api.main:app --host 0.0.0.0 --port $PORT",
+            "startCommand": "pip install -r requirements.txt && uvicorn src.api.main:app --host 0.0.0.0 --port $PORT --ws-per-message-deflate false",
             "healthcheckPath": "/health",
             "healthcheckTimeout": 100,
             "restartPolicyType": "on_failure",
@@ -91,7 +91,7 @@ def create_deployment_files():
     
     # Heroku Procfile
     with open("Procfile", "w") as f:
-        f.write("web: uvicorn src.api.main:app --host 0.0.0.0 --port $PORT\n")
+        f.write("web: uvicorn src.api.main:app --host 0.0.0.0 --port $PORT --ws-per-message-deflate false\n")
     print("✅ Created Procfile")
     
     # Runtime specification for Heroku
@@ -133,7 +133,7 @@ def show_railway_steps():
     print("4. Select your repository")
     print("5. Configure service:")
     print("   - Name: logistics-ai-api")
-    print("   - Start Command: uvicorn src.api.main:app --host 0.0.0.0 --port $PORT")
+    print("   - Start Command: uvicorn src.api.main:app --host 0.0.0.0 --port $PORT --ws-per-message-deflate false")
     print("6. Add Environment Variables:")
     print("   - GROQ_API_KEY: your_groq_api_key")
     print("   - PORT: 8000")
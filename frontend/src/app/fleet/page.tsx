@@ -61,14 +61,15 @@ const FleetPage: React.FC = () => {
           // Subscribe to truck location updates
           ws?.send(JSON.stringify({
             type: 'subscribe',
-            events: ['truck_location_update', 'truck_status_update']
+            events: ['truck_location_update', 'truck_location_batch', 'truck_status_update']
           }));
         };
 
         ws.onmessage = (event) => {
           try {
             const message = JSON.parse(event.data);
-            if (message.type === 'truck_location_update') {
+            if (message.type === 'truck_location_update' ||
+                message.type === 'truck_location_batch') {
               // Refetch to get updated data
               // In a production app, you'd update state directly
               refetch();
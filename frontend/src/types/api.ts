@@ -248,6 +248,9 @@ export interface TruckLocationUpdate {
   timestamp: string;
 }
 
+// Data of a truck_location_batch message: every truck moved in one tick
+export type TruckLocationBatch = TruckLocationUpdate[];
+
 export interface IssueAlert {
   issue_id: string;
   type: string;
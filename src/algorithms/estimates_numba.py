@@ -0,0 +1,57 @@
+"""
+Numba-compiled kernels for delivery request cost and time estimates.
+
+Numba is optional: without it the kernels run as plain Python functions
+with identical results.
+"""
+from src.models import LoadPriority, NUMBA_AVAILABLE, haversine_km, njit
+
+
+# Pricing and timing parameters
+BASE_COST = 50.0  # Base fee
+COST_PER_KM = 2.5
+COST_PER_KG = 0.1
+AVG_SPEED_KMH = 45.0  # Average including stops
+PICKUP_LEAD_HOURS = 0.5  # 30 min to reach pickup
+
+# Per-priority factors, indexed by PRIORITY_CODES
+PRIORITY_CODES = {priority: code for code, priority in enumerate(LoadPriority)}
+PRIORITY_MULTIPLIERS = (0.8, 1.0, 1.3, 1.6, 2.0)
+BUFFER_HOURS = (2.0, 1.5, 1.0, 0.5, 0.25)
+
+
+@njit(cache=True, fastmath=True)
+def estimate(
+    lat1: float,
+    lon1: float,
+    lat2: float,
+    lon2: float,
+    weight_kg: float,
+    priority_idx: int,
+) -> tuple[float, float]:
+    """
+    Estimate cost and total delivery hours for a single request.
+
+    Args:
+        lat1, lon1: Pickup coordinates
+        lat2, lon2: Delivery coordinates
+        weight_kg: Load weight
+        priority_idx: Priority code from PRIORITY_CODES
+
+    Returns:
+        Tuple of (estimated cost, travel plus buffer hours)
+    """
+    distance = haversine_km(lat1, lon1, lat2, lon2)
+
+    cost = (
+        (BASE_COST + distance * COST_PER_KM + weight_kg * COST_PER_KG)
+        * PRIORITY_MULTIPLIERS[priority_idx]
+    )
+    hours = distance / AVG_SPEED_KMH + BUFFER_HOURS[priority_idx]
+
+    return cost, hours
+
+
+# Compile at import so the first request doesn't pay the JIT cost
+if NUMBA_AVAILABLE:
+    estimate(40.7128, -74.0060, 40.7589, -73.9851, 1.0, 0)
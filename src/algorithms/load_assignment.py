@@ -6,10 +6,35 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import heapq
 
-from src.models import Truck, Load, Location, TruckStatus, LoadPriority
+from src.models import Truck, Load, Location, TruckStatus, LoadPriority, build_location_matrix, haversine_matrix
 from src.algorithms.route_optimizer import RouteOptimizer
 
 
+# Upper bound on memoized distances before the cache is reset
+DISTANCE_CACHE_MAXSIZE = 10000
+
+# Membership sets, built once rather than as a list literal per check
+ASSIGNABLE_STATUSES = frozenset({TruckStatus.IDLE, TruckStatus.EN_ROUTE})
+URGENT_PRIORITIES = frozenset({LoadPriority.CRITICAL, LoadPriority.URGENT})
+
+# Per-priority lookup tables, built once rather than on every call
+PRIORITY_COST_MULTIPLIERS: Dict[LoadPriority, float] = {
+    LoadPriority.LOW: 1.2,
+    LoadPriority.NORMAL: 1.0,
+    LoadPriority.HIGH: 0.8,
+    LoadPriority.URGENT: 0.6,
+    LoadPriority.CRITICAL: 0.4
+}
+
+PRIORITY_SCORES: Dict[LoadPriority, float] = {
+    LoadPriority.LOW: 1.0,
+    LoadPriority.NORMAL: 2.0,
+    LoadPriority.HIGH: 3.0,
+    LoadPriority.URGENT: 4.0,
+    LoadPriority.CRITICAL: 5.0
+}
+
+
 @dataclass
 class Assignment:
     """A truck-load assignment with cost and timing."""
@@ -46,7 +71,43 @@ class LoadAssignmentEngine:
     
     def __init__(self):
         self.route_optimizer = RouteOptimizer()
-        
+        # Haversine distances keyed by both endpoints' coordinates; a truck
+        # that moves simply produces new keys, so nothing needs evicting
+        self._distance_cache: Dict[Tuple[float, float, float, float], float] = {}
+    
+    def _distance_km(self, origin: Location, destination: Location) -> float:
+        """Distance between two locations, memoized across calls."""
+        key = (origin.latitude, origin.longitude, destination.latitude, destination.longitude)
+        distance = self._distance_cache.get(key)
+        if distance is None:
+            if len(self._distance_cache) >= DISTANCE_CACHE_MAXSIZE:
+                self._distance_cache.clear()
+            distance = origin.distance_to(destination)
+            self._distance_cache[key] = distance
+        return distance
+        
+    def _prime_pickup_distances(self, trucks: List[Truck], loads: List[Load]):
+        """Compute every truck-to-pickup distance in one batched kernel call."""
+        if not loads:
+            return
+        # Prime no more pairs than the cache may hold; distances for the
+        # remaining trucks are computed on demand by _distance_km
+        located = [t.current_location for t in trucks if t.current_location]
+        located = located[:DISTANCE_CACHE_MAXSIZE // len(loads)]
+        if not located:
+            return
+        if len(self._distance_cache) + len(located) * len(loads) > DISTANCE_CACHE_MAXSIZE:
+            self._distance_cache.clear()
+
+        pickups = [l.pickup_location for l in loads]
+        distances = haversine_matrix(
+            build_location_matrix(located), build_location_matrix(pickups)
+        ).tolist()
+        for origin, row in zip(located, distances):
+            for destination, distance in zip(pickups, row):
+                key = (origin.latitude, origin.longitude, destination.latitude, destination.longitude)
+                self._distance_cache[key] = distance
+
     def assign_loads_to_trucks(
         self,
         trucks: List[Truck],
@@ -67,7 +128,7 @@ class LoadAssignmentEngine:
         # Filter available trucks
         available_trucks = [
             t for t in trucks 
-            if t.status in [TruckStatus.IDLE, TruckStatus.EN_ROUTE] 
+            if t.status in ASSIGNABLE_STATUSES
             and t.current_location is not None
         ]
         
@@ -199,8 +260,8 @@ class LoadAssignmentEngine:
         Priority-first assignment - handle urgent loads first.
         """
         # Separate loads by priority
-        critical_loads = [l for l in loads if l.priority in [LoadPriority.CRITICAL, LoadPriority.URGENT]]
-        normal_loads = [l for l in loads if l.priority not in [LoadPriority.CRITICAL, LoadPriority.URGENT]]
+        critical_loads = [l for l in loads if l.priority in URGENT_PRIORITIES]
+        normal_loads = [l for l in loads if l.priority not in URGENT_PRIORITIES]
         
         assignments = []
         total_cost = 0.0
@@ -238,6 +299,8 @@ class LoadAssignmentEngine:
     
     def _build_cost_matrix(self, trucks: List[Truck], loads: List[Load]) -> List[List[float]]:
         """Build cost matrix for assignment problem."""
+        self._prime_pickup_distances(trucks, loads)
+
         matrix = []
         
         for truck in trucks:
@@ -260,8 +323,8 @@ class LoadAssignmentEngine:
         
         # Fuel constraint (rough estimate)
         if truck.current_location:
-            distance_to_pickup = truck.current_location.distance_to(load.pickup_location)
-            delivery_distance = load.pickup_location.distance_to(load.delivery_location)
+            distance_to_pickup = self._distance_km(truck.current_location, load.pickup_location)
+            delivery_distance = self._distance_km(load.pickup_location, load.delivery_location)
             total_distance = distance_to_pickup + delivery_distance
             
             fuel_needed = total_distance * 0.3  # L/km
@@ -284,8 +347,8 @@ class LoadAssignmentEngine:
             return float('inf')
         
         # Distance costs
-        distance_to_pickup = truck.current_location.distance_to(load.pickup_location)
-        delivery_distance = load.pickup_location.distance_to(load.delivery_location)
+        distance_to_pickup = self._distance_km(truck.current_location, load.pickup_location)
+        delivery_distance = self._distance_km(load.pickup_location, load.delivery_location)
         total_distance = distance_to_pickup + delivery_distance
         
         # Time costs
@@ -300,13 +363,7 @@ class LoadAssignmentEngine:
         time_cost = total_time_hours * (25.0 + 10.0)  # Driver + vehicle costs
         
         # Priority adjustment
-        priority_multiplier = {
-            LoadPriority.LOW: 1.2,
-            LoadPriority.NORMAL: 1.0,
-            LoadPriority.HIGH: 0.8,
-            LoadPriority.URGENT: 0.6,
-            LoadPriority.CRITICAL: 0.4
-        }.get(load.priority, 1.0)
+        priority_multiplier = PRIORITY_COST_MULTIPLIERS.get(load.priority, 1.0)
         
         base_cost = fuel_cost + time_cost
         return base_cost * priority_multiplier
@@ -317,14 +374,14 @@ class LoadAssignmentEngine:
         
         # Estimate pickup time
         if truck.current_location:
-            distance_to_pickup = truck.current_location.distance_to(load.pickup_location)
+            distance_to_pickup = self._distance_km(truck.current_location, load.pickup_location)
             pickup_time_hours = distance_to_pickup / 50.0  # 50 km/h avg speed
             pickup_eta = now + timedelta(hours=pickup_time_hours)
         else:
             pickup_eta = now + timedelta(hours=1)  # Default estimate
         
         # Estimate delivery time
-        delivery_distance = load.pickup_location.distance_to(load.delivery_location)
+        delivery_distance = self._distance_km(load.pickup_location, load.delivery_location)
         delivery_time_hours = delivery_distance / 50.0
         delivery_eta = pickup_eta + timedelta(hours=delivery_time_hours)
         
@@ -353,8 +410,8 @@ class LoadAssignmentEngine:
         if not truck.current_location:
             return now + timedelta(hours=4)  # Default estimate
         
-        distance_to_pickup = truck.current_location.distance_to(load.pickup_location)
-        delivery_distance = load.pickup_location.distance_to(load.delivery_location)
+        distance_to_pickup = self._distance_km(truck.current_location, load.pickup_location)
+        delivery_distance = self._distance_km(load.pickup_location, load.delivery_location)
         total_distance = distance_to_pickup + delivery_distance
         
         # Estimate time with traffic buffer
@@ -375,25 +432,19 @@ class LoadAssignmentEngine:
         
         # Distance factor
         if truck.current_location:
-            distance = truck.current_location.distance_to(load.pickup_location)
+            distance = self._distance_km(truck.current_location, load.pickup_location)
             if distance > 100:  # Long distance reduces confidence
                 base_confidence -= 0.1
         
         # Priority factor
-        if load.priority in [LoadPriority.CRITICAL, LoadPriority.URGENT]:
+        if load.priority in URGENT_PRIORITIES:
             base_confidence += 0.1  # More attention for urgent loads
         
         return max(0.3, min(1.0, base_confidence))
     
     def _priority_to_numeric(self, priority: LoadPriority) -> float:
         """Convert priority to numeric score (higher = more urgent)."""
-        return {
-            LoadPriority.LOW: 1.0,
-            LoadPriority.NORMAL: 2.0,
-            LoadPriority.HIGH: 3.0,
-            LoadPriority.URGENT: 4.0,
-            LoadPriority.CRITICAL: 5.0
-        }.get(priority, 2.0)
+        return PRIORITY_SCORES.get(priority, 2.0)
     
     def _calculate_on_time_probability(self, assignments: List[Assignment]) -> float:
         """Calculate probability that all assignments will be on time."""
@@ -4,7 +4,7 @@ Route optimization algorithms for logistics planning.
 import math
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
-from src.models import Location, Truck, Load, TrafficCondition
+from src.models import Location, Truck, Load, TrafficCondition, build_location_matrix, haversine_matrix
 
 
 @dataclass
@@ -192,15 +192,10 @@ class RouteOptimizer:
     
     def _calculate_distance_matrix(self, locations: List[Location]) -> List[List[float]]:
         """Calculate distance matrix between all locations."""
-        n = len(locations)
-        matrix = [[0.0] * n for _ in range(n)]
-        
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    matrix[i][j] = locations[i].distance_to(locations[j])
-        
-        return matrix
+        coords = build_location_matrix(locations)
+        matrix = haversine_matrix(coords, coords)
+        matrix.flat[::len(locations) + 1] = 0.0
+        return matrix.tolist()
     
     def _apply_traffic_factors(
         self,
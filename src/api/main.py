@@ -7,10 +7,16 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from config.settings import configure_logging
+
+# Before importing the services, so no logger is cached with the defaults
+configure_logging()
+
 from src.api.websocket import ws_manager
 from src.api.routes import fleet_router, control_loop_router, decisions_router, requests_router
 from src.api.services.simulation import simulation_service
 from src.api.services.state_manager import state_manager
+from src.api.services.request_processor import request_processor
 
 # Optional database service
 try:
@@ -38,6 +44,8 @@ async def lifespan(app: FastAPI):
     else:
         print("Using in-memory storage (database not available)")
     
+    await request_processor.open()
+
     print("Initializing simulation data...")
     simulation_service.generate_initial_data(num_trucks=10)
     print(f"Generated {len(state_manager.trucks)} trucks, {len(state_manager.loads)} loads")
@@ -47,6 +55,7 @@ async def lifespan(app: FastAPI):
     # Shutdown: Clean up background tasks
     print("Shutting down background tasks...")
     await simulation_service.stop_background_updates()
+    await request_processor.aclose()
 
 
 # Create FastAPI app
@@ -206,7 +215,9 @@ async def websocket_endpoint(websocket: WebSocket):
                 )
             # Handle subscription requests
             elif data.get("type") == "subscribe":
-                # Client wants to subscribe to specific events
+                # Client wants to subscribe to specific events; driver apps
+                # also name their truck so assignments can be targeted
+                ws_manager.register(websocket, data.get("truck_id"))
                 await ws_manager.send_personal_message(
                     {
                         "type": "subscribed",
@@ -239,5 +250,7 @@ if __name__ == "__main__":
         "src.api.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        reload=True,
+        # Broadcasts are serialized once; don't compress them again per client
+        ws_per_message_deflate=False
     )
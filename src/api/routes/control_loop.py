@@ -2,6 +2,7 @@
 Control loop API routes.
 """
 
+from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter
 from pydantic import BaseModel
@@ -55,7 +56,9 @@ async def start_control_loop(request: StartControlLoopRequest = None):
     state_manager.start_control_loop()
 
     # Start background simulation updates with WebSocket broadcasting
-    await simulation_service.start_background_updates(ws_manager.broadcast)
+    await simulation_service.start_background_updates(
+        ws_manager.broadcast, ws_manager.has_clients
+    )
 
     # Broadcast the start event
     await ws_manager.broadcast({
@@ -68,6 +71,7 @@ async def start_control_loop(request: StartControlLoopRequest = None):
             "decisions_pending": len(state_manager.pending_decisions),
             "event": "started"
         },
+        "timestamp": datetime.utcnow(),
         "source": "control_loop"
     })
 
@@ -107,6 +111,7 @@ async def stop_control_loop(request: StopControlLoopRequest = None):
             "event": "stopped",
             "reason": request.reason if request else None
         },
+        "timestamp": datetime.utcnow(),
         "source": "control_loop"
     })
 
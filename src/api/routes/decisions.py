@@ -2,6 +2,7 @@
 Decision management API routes.
 """
 
+from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
@@ -62,6 +63,7 @@ async def approve_decision(request: ApproveDecisionRequest):
             "reason": request.reason,
             "confidence": decision.confidence
         },
+        "timestamp": datetime.utcnow(),
         "source": "decision_engine"
     })
 
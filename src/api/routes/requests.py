@@ -70,6 +70,11 @@ class RequestResponseDTO(BaseModel):
     allocation_reasoning: Optional[str] = None
 
 
+class ProcessBatchDTO(BaseModel):
+    """DTO for triggering processing of several requests at once."""
+    request_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+
 class RequestSummaryDTO(BaseModel):
     """DTO for request summary statistics."""
     total_requests: int
@@ -111,7 +116,8 @@ async def create_request(
                 "type": "new_request",
                 "request_id": request.id,
                 "customer": request.customer_name,
-                "status": request.status
+                "status": request.status,
+                "timestamp": datetime.utcnow()
             }
         )
         
@@ -221,13 +227,40 @@ async def process_request(
         ws_manager.broadcast,
         {
             "type": "request_processing_started",
-            "request_id": request_id
+            "request_id": request_id,
+            "timestamp": datetime.utcnow()
         }
     )
     
     return {"message": "Request processing started"}
 
 
+@router.put("/process-batch")
+async def process_request_batch(
+    batch: ProcessBatchDTO,
+    background_tasks: BackgroundTasks
+) -> dict:
+    """Trigger AI processing of several pending requests as one batch."""
+    started = await request_processor.process_batch(batch.request_ids)
+    
+    if not started:
+        raise HTTPException(status_code=400, detail="No requests can be processed")
+    
+    # Notify WebSocket clients
+    now = datetime.utcnow()
+    for request_id in started:
+        background_tasks.add_task(
+            ws_manager.broadcast,
+            {
+                "type": "request_processing_started",
+                "request_id": request_id,
+                "timestamp": now
+            }
+        )
+    
+    return {"message": "Batch processing started", "request_ids": started}
+
+
 @router.put("/{request_id}/cancel")
 async def cancel_request(
     request_id: str,
@@ -246,7 +279,8 @@ async def cancel_request(
         )
     
     # Update status
-    request.status = RequestStatus.CANCELLED
+    request_processor.set_status(request, RequestStatus.CANCELLED)
+    await request_processor.flush()
     
     # Notify WebSocket clients
     background_tasks.add_task(
@@ -254,7 +288,8 @@ async def cancel_request(
         {
             "type": "request_cancelled",
             "request_id": request_id,
-            "customer": request.customer_name
+            "customer": request.customer_name,
+            "timestamp": datetime.utcnow()
         }
     )
     
@@ -285,7 +320,7 @@ async def get_request_tracking(request_id: str) -> dict:
     # Add truck location if assigned
     if request.assigned_truck_id:
         from src.api.services.state_manager import state_manager
-        truck = next((t for t in state_manager.trucks if t.id == request.assigned_truck_id), None)
+        truck = state_manager.get_truck(request.assigned_truck_id)
         if truck and truck.current_location:
             tracking_info["current_location"] = {
                 "latitude": truck.current_location.latitude,
@@ -320,7 +355,7 @@ async def get_active_journeys() -> dict:
                 continue
                 
             # Find the assigned truck
-            truck = next((t for t in state_manager.trucks if t.id == request.assigned_truck_id), None)
+            truck = state_manager.get_truck(request.assigned_truck_id)
             if not truck or not truck.current_location:
                 continue
             
@@ -5,7 +5,9 @@ Enhanced simulation service with real algorithms.
 import asyncio
 import uuid
 import random
+from bisect import bisect
 from datetime import datetime, timedelta
+from itertools import accumulate
 from typing import Optional, Callable, List
 import structlog
 
@@ -19,6 +21,22 @@ from src.algorithms.load_assignment import LoadAssignmentEngine
 
 logger = structlog.get_logger(__name__)
 
+# Weighted odds as cumulative weights, for single draws with _weighted_choice
+_TRUCK_STATUSES = (TruckStatus.IDLE, TruckStatus.EN_ROUTE, TruckStatus.LOADING)
+_TRUCK_STATUS_CUM_WEIGHTS = tuple(accumulate((0.4, 0.5, 0.1)))
+_LOAD_PRIORITIES = tuple(LoadPriority)
+_LOAD_PRIORITY_CUM_WEIGHTS = tuple(accumulate((0.2, 0.5, 0.2, 0.08, 0.02)))  # Most normal, few critical
+_TRAFFIC_LEVELS = (
+    TrafficLevel.FREE_FLOW, TrafficLevel.LIGHT, TrafficLevel.MODERATE,
+    TrafficLevel.HEAVY, TrafficLevel.STANDSTILL,
+)
+_TRAFFIC_LEVEL_CUM_WEIGHTS = tuple(accumulate((0.1, 0.2, 0.3, 0.3, 0.1)))
+
+
+def _weighted_choice(options: tuple, cum_weights: tuple):
+    """Pick one option with one random draw and a bisect over the cumulative weights."""
+    return options[bisect(cum_weights, random.random() * cum_weights[-1])]
+
 
 class EnhancedSimulationService:
     """
@@ -41,11 +59,11 @@ class EnhancedSimulationService:
 
         # Generate trucks with realistic locations (NYC area)
         trucks = self._generate_realistic_trucks(num_trucks)
-        state_manager.trucks = trucks
+        state_manager.set_trucks(trucks)
 
         # Generate loads with realistic pickup/delivery locations
         loads = self._generate_realistic_loads(num_loads)
-        state_manager.loads = loads
+        state_manager.set_loads(loads)
 
         # Generate traffic conditions
         traffic_conditions = self._generate_realistic_traffic()
@@ -93,10 +111,7 @@ class EnhancedSimulationService:
             lat += random.uniform(-0.05, 0.05)
             lng += random.uniform(-0.05, 0.05)
 
-            status = random.choices(
-                [TruckStatus.IDLE, TruckStatus.EN_ROUTE, TruckStatus.LOADING],
-                weights=[0.4, 0.5, 0.1]
-            )[0]
+            status = _weighted_choice(_TRUCK_STATUSES, _TRUCK_STATUS_CUM_WEIGHTS)
 
             truck = Truck(
                 id=f"TRK-{i+1:03d}",
@@ -155,10 +170,7 @@ class EnhancedSimulationService:
             delivery_lat += random.uniform(-0.01, 0.01)
             delivery_lng += random.uniform(-0.01, 0.01)
 
-            priority = random.choices(
-                list(LoadPriority),
-                weights=[0.2, 0.5, 0.2, 0.08, 0.02]  # Most normal, few critical
-            )[0]
+            priority = _weighted_choice(_LOAD_PRIORITIES, _LOAD_PRIORITY_CUM_WEIGHTS)
 
             # Set delivery deadline based on priority
             now = datetime.utcnow()
@@ -215,11 +227,7 @@ class EnhancedSimulationService:
 
         for route_name, level, speed in routes:
             # Add some randomness to current conditions
-            current_level = random.choices(
-                [TrafficLevel.FREE_FLOW, TrafficLevel.LIGHT, TrafficLevel.MODERATE, 
-                 TrafficLevel.HEAVY, TrafficLevel.STANDSTILL],
-                weights=[0.1, 0.2, 0.3, 0.3, 0.1]
-            )[0]
+            current_level = _weighted_choice(_TRAFFIC_LEVELS, _TRAFFIC_LEVEL_CUM_WEIGHTS)
             
             current_speed = speed + random.uniform(-10, 10)
             current_speed = max(5, current_speed)  # Minimum 5 km/h
@@ -254,7 +262,7 @@ class EnhancedSimulationService:
 
     def _perform_initial_assignments(self):
         """Perform initial load assignments using our algorithm."""
-        available_trucks = [t for t in state_manager.trucks if t.status == TruckStatus.IDLE]
+        available_trucks = state_manager.get_trucks_by_status(TruckStatus.IDLE)
         unassigned_loads = [l for l in state_manager.loads if not l.assigned_truck_id]
 
         if not available_trucks or not unassigned_loads:
@@ -268,17 +276,15 @@ class EnhancedSimulationService:
         # Apply assignments
         for assignment in solution.assignments:
             # Find and update the load
-            for load in state_manager.loads:
-                if load.id == assignment.load_id:
-                    load.assigned_truck_id = assignment.truck_id
-                    break
+            load = state_manager.get_load(assignment.load_id)
+            if load:
+                load.assigned_truck_id = assignment.truck_id
             
             # Update truck status
-            for truck in state_manager.trucks:
-                if truck.id == assignment.truck_id:
-                    truck.status = TruckStatus.EN_ROUTE
-                    truck.current_load_id = assignment.load_id
-                    break
+            truck = state_manager.trucks_by_id.get(assignment.truck_id)
+            if truck:
+                state_manager.set_truck_status(truck, TruckStatus.EN_ROUTE)
+                truck.current_load_id = assignment.load_id
 
         logger.info(
             "Initial assignments completed",
@@ -292,10 +298,7 @@ class EnhancedSimulationService:
         for truck in state_manager.trucks:
             if truck.current_load_id and truck.status == TruckStatus.EN_ROUTE:
                 # Find the assigned load
-                assigned_load = next(
-                    (l for l in state_manager.loads if l.id == truck.current_load_id), 
-                    None
-                )
+                assigned_load = state_manager.get_load(truck.current_load_id)
                 
                 if assigned_load and truck.current_location:
                     # Generate optimized route
@@ -503,13 +506,12 @@ class EnhancedSimulationService:
         route.actual_distance_km = route.estimated_distance_km  # Simplified
         
         # Update load
-        for load in state_manager.loads:
-            if load.id == truck.current_load_id:
-                load.delivered_at = datetime.utcnow()
-                break
+        load = state_manager.get_load(truck.current_load_id)
+        if load:
+            load.delivered_at = datetime.utcnow()
         
         # Update truck
-        truck.status = TruckStatus.IDLE
+        state_manager.set_truck_status(truck, TruckStatus.IDLE)
         truck.current_load_id = None
         truck.total_deliveries += 1
         truck.total_distance_km += route.estimated_distance_km
@@ -525,7 +527,7 @@ class EnhancedSimulationService:
         """Generate a new load during simulation."""
         new_loads = self._generate_realistic_loads(1)
         if new_loads:
-            state_manager.loads.extend(new_loads)
+            state_manager.add_loads(new_loads)
             logger.info("New load generated", load_id=new_loads[0].id)
 
     async def _broadcast_fleet_update(self):
@@ -534,6 +536,7 @@ class EnhancedSimulationService:
             return
 
         # Prepare update data
+        now = datetime.utcnow()
         update_data = {
             "type": "fleet_update",
             "data": {
@@ -541,8 +544,9 @@ class EnhancedSimulationService:
                 "loads": [l.model_dump() for l in state_manager.loads],
                 "traffic_conditions": [tc.model_dump() for tc in state_manager.traffic_conditions],
                 "active_routes": [r.model_dump() for r in state_manager.routes if not r.completed_at],
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now.isoformat()
             },
+            "timestamp": now,
             "source": "enhanced_simulation"
         }
 
@@ -9,25 +9,118 @@ This service processes incoming delivery requests using AI to:
 """
 
 import asyncio
+import hashlib
+import time
 import uuid
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 
+import httpx
+import numpy as np
+import orjson
 import structlog
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 
 from src.models import (
     DeliveryRequest, RequestStatus, Load, Location, 
-    LoadPriority, Truck, TruckStatus
+    LoadPriority, Truck, TruckStatus, EARTH_RADIUS_KM
 )
 from src.reasoning.grok_client import get_groq_client
-from src.algorithms.load_assignment import LoadAssignmentEngine
+from src.algorithms.load_assignment import Assignment, LoadAssignmentEngine
 from src.algorithms.route_optimizer import RouteOptimizer
+from src.api.websocket import ws_manager
+from src.algorithms.estimates_numba import (
+    BASE_COST, COST_PER_KM, COST_PER_KG, AVG_SPEED_KMH,
+    PICKUP_LEAD_HOURS, PRIORITY_CODES, PRIORITY_MULTIPLIERS, BUFFER_HOURS,
+    estimate
+)
+from .request_store import RequestStore
 from .state_manager import state_manager
 
 logger = structlog.get_logger(__name__)
 
+NOMINATIM_BASE_URL = "https://nominatim.openstreetmap.org"
+
+# Service area (NYC region): roughly 40.4-41.0 latitude, -74.5 to -73.5 longitude
+NYC_LAT_MIN, NYC_LAT_MAX = 40.4, 41.0
+NYC_LON_MIN, NYC_LON_MAX = -74.5, -73.5
+
+# AI responses are reused for requests with the same fingerprint
+AI_CACHE_MAXSIZE = 2048
+AI_CACHE_TTL_SECONDS = 3600
+
+# Background processing: at most REQUEST_WORKERS jobs run at once, and new
+# jobs are refused once REQUEST_QUEUE_MAXSIZE are waiting
+REQUEST_WORKERS = 8
+REQUEST_QUEUE_MAXSIZE = 1000
+
+# Below this many requests, NumPy's per-call overhead outweighs the
+# vectorized kernels and batches use the scalar checks instead
+VECTORIZE_MIN_BATCH = 16
+
+SECONDS_PER_HOUR = 3600.0
+
+# Naive datetimes in notifications are UTC; tag them so clients don't read
+# them as local time
+_ORJSON_NAIVE_UTC = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# Per-priority factors for the batch estimator, indexed by PRIORITY_CODES
+_PRIORITY_MULTIPLIERS_NP = np.array(PRIORITY_MULTIPLIERS)
+_BUFFER_HOURS_NP = np.array(BUFFER_HOURS)
+
+
+def _haversine_np(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """Vectorized Haversine distance in km between coordinate arrays."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def _in_nyc_region_np(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """
+    Vectorized service area check; NaN coordinates are reported as outside.
+    
+    The four comparisons are combined with bitwise & rather than `and`, so
+    the whole batch is checked without per-element branches.
+    """
+    return (lat >= NYC_LAT_MIN) & (lat <= NYC_LAT_MAX) & (lon >= NYC_LON_MIN) & (lon <= NYC_LON_MAX)
+
+
+class _TTLCache:
+    """Small LRU cache whose entries expire after a fixed time-to-live."""
+    
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+    
+    def get(self, key: Any) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        
+        self._data.move_to_end(key)
+        return value
+    
+    def set(self, key: Any, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry if full."""
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
 
 class RequestProcessor:
     """Service for processing delivery requests with AI assistance."""
@@ -36,10 +129,27 @@ class RequestProcessor:
         self.groq_client = get_groq_client()
         self.assignment_engine = LoadAssignmentEngine()
         self.route_optimizer = RouteOptimizer()
-        self.geocoder = Nominatim(user_agent="logistics-ai")
         
-        # In-memory storage for requests (in production, use database)
+        # Persistent HTTP client so geocoding reuses keep-alive connections;
+        # created by open() on the running loop and closed by aclose()
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        # Cached Groq responses keyed by request fingerprint and allocated truck
+        self._analysis_cache = _TTLCache(AI_CACHE_MAXSIZE, AI_CACHE_TTL_SECONDS)
+        
+        # Working set of requests, written through to SQLite by flush()
         self.requests: Dict[str, DeliveryRequest] = {}
+        # Requests bucketed by status, kept in sync by set_status
+        self._by_status: defaultdict[RequestStatus, Dict[str, DeliveryRequest]] = defaultdict(dict)
+        self._store = RequestStore()
+        # IDs of requests changed since the last flush
+        self._dirty: set[str] = set()
+        
+        # Processing jobs, consumed by a fixed pool of worker tasks that is
+        # started on first use. The queue is created by open(), so each app
+        # start gets one on its own event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
     
     async def submit_request(self, request_data: Dict[str, Any]) -> DeliveryRequest:
         """
@@ -61,6 +171,9 @@ class RequestProcessor:
         
         # Store request
         self.requests[request_id] = request
+        self._by_status[request.status][request_id] = request
+        self._dirty.add(request_id)
+        await self.flush()
         
         logger.info("New delivery request submitted", 
                    request_id=request_id, 
@@ -74,90 +187,211 @@ class RequestProcessor:
     async def _process_request(self, request: DeliveryRequest) -> None:
         """Process a delivery request through the AI pipeline."""
         try:
-            request.status = RequestStatus.PROCESSING
+            self.set_status(request, RequestStatus.PROCESSING)
             
             # Step 1: Geocode addresses
             await self._geocode_addresses(request)
             
-            # Step 2: AI analysis of request
-            await self._analyze_request_with_ai(request)
-            
-            # Step 3: Find optimal truck allocation
+            # Step 2: Find optimal truck allocation
             await self._allocate_truck(request)
             
-            # Step 4: Create load and update assignments
-            await self._create_load_assignment(request)
-            
-            # Step 5: Calculate estimates
-            await self._calculate_estimates(request)
-            
-            # Validate that truck allocation was successful
-            if request.assigned_truck_id:
-                request.status = RequestStatus.ASSIGNED
-                request.processed_at = datetime.utcnow()
+            # Step 3: Analyze the request and explain the allocation in one AI
+            # call; nothing below reads its result, so it runs in the background
+            ai_task = await self._start_analysis([request])
+            try:
+                # Step 4: Create load and update assignments
+                await self._create_load_assignment(request)
                 
-                logger.info("Request processing completed", 
-                           request_id=request.id,
-                           assigned_truck=request.assigned_truck_id)
-            else:
-                request.status = RequestStatus.FAILED
-                logger.error("Request processing failed - no truck allocated", 
-                            request_id=request.id)
+                # Step 5: Calculate estimates
+                await self._calculate_estimates(request)
+            finally:
+                await ai_task
+            
+            self._finish_processing(request)
             
         except Exception as e:
             logger.error("Request processing failed", 
                         request_id=request.id, 
                         error=str(e))
-            request.status = RequestStatus.FAILED
-    
-    async def _geocode_addresses(self, request: DeliveryRequest) -> None:
-        """Convert addresses to coordinates."""
-        pickup_geocoded = False
-        delivery_geocoded = False
+            self.set_status(request, RequestStatus.FAILED)
         
+        await self.flush()
+    
+    async def _process_batch(self, requests: List[DeliveryRequest]) -> None:
+        """Process several requests together, vectorizing the numeric steps."""
+        ai_task = None
         try:
-            # Geocode pickup address
-            if not request.pickup_location:
-                pickup_loc = await asyncio.to_thread(
-                    self.geocoder.geocode, request.pickup_address
-                )
-                if pickup_loc:
-                    request.pickup_location = Location(
-                        latitude=pickup_loc.latitude,
-                        longitude=pickup_loc.longitude,
-                        address=request.pickup_address
-                    )
-                    pickup_geocoded = True
+            # Step 1: Geocode every address concurrently, then check the service
+            # area for the whole batch at once
+            await asyncio.gather(*(self._lookup_addresses(request) for request in requests))
             
-            # Geocode delivery address
-            if not request.delivery_location:
-                delivery_loc = await asyncio.to_thread(
-                    self.geocoder.geocode, request.delivery_address
-                )
-                if delivery_loc:
-                    request.delivery_location = Location(
-                        latitude=delivery_loc.latitude,
-                        longitude=delivery_loc.longitude,
-                        address=request.delivery_address
-                    )
-                    delivery_geocoded = True
+            if len(requests) >= VECTORIZE_MIN_BATCH:
+                in_region = self._service_area_mask(requests).tolist()
+            else:
+                in_region = [self._in_service_area(request) for request in requests]
+            for request, request_in_region in zip(requests, in_region):
+                self._apply_location_fallbacks(request, request_in_region)
+            
+            # Step 2: Allocate the whole batch with one assignment engine call
+            await self._allocate_trucks_batch(requests)
+            allocated = [request for request in requests if request.status != RequestStatus.FAILED]
+            
+            # Step 3: The AI calls for the batch run concurrently in the background
+            # while loads are created and estimates calculated
+            ai_task = await self._start_analysis(allocated)
+            
+            # Step 4: Create loads and update assignments
+            for request in list(allocated):
+                try:
+                    await self._create_load_assignment(request)
+                except Exception as e:
+                    logger.error("Request processing failed", 
+                                request_id=request.id, 
+                                error=str(e))
+                    self.set_status(request, RequestStatus.FAILED)
+                    allocated.remove(request)
+            
+            # Step 5: Calculate estimates for the whole batch in one pass
+            if len(allocated) >= VECTORIZE_MIN_BATCH:
+                self._calculate_estimates_batch(allocated)
+            else:
+                for request in allocated:
+                    await self._calculate_estimates(request)
+            
+            analysis, ai_task = ai_task, None
+            await analysis
+            
+            for request in allocated:
+                self._finish_processing(request)
             
-        except (GeocoderTimedOut, GeocoderServiceError) as e:
+        except Exception as e:
+            logger.error("Batch processing failed", 
+                        requests=len(requests), 
+                        error=str(e))
+            # Only PENDING requests are picked up again, so nothing may be
+            # left PROCESSING
+            for request in requests:
+                if request.status == RequestStatus.PROCESSING:
+                    self.set_status(request, RequestStatus.FAILED)
+        
+        finally:
+            # The analysis was not awaited if a step before it failed
+            if ai_task is not None:
+                ai_task.cancel()
+                await asyncio.gather(ai_task, return_exceptions=True)
+            await self.flush()
+    
+    async def _start_analysis(self, requests: List[DeliveryRequest]) -> asyncio.Future:
+        """Start the AI analysis of several requests in the background."""
+        analysis = asyncio.gather(
+            *(self._analyze_request_with_ai(request) for request in requests)
+        )
+        # Yield once so the tasks reach their Groq calls, which run in worker
+        # threads, before the caller carries on with its own work
+        await asyncio.sleep(0)
+        return analysis
+    
+    def _finish_processing(self, request: DeliveryRequest) -> None:
+        """Set the final status depending on whether a truck was allocated."""
+        if request.assigned_truck_id:
+            self.set_status(request, RequestStatus.ASSIGNED)
+            request.processed_at = datetime.utcnow()
+            
+            logger.info("Request processing completed", 
+                       request_id=request.id,
+                       assigned_truck=request.assigned_truck_id)
+        else:
+            self.set_status(request, RequestStatus.FAILED)
+            logger.error("Request processing failed - no truck allocated", 
+                        request_id=request.id)
+    
+    async def _geocode_address(
+        self,
+        request: DeliveryRequest,
+        address: str,
+        existing: Optional[Location]
+    ) -> Optional[Location]:
+        """Geocode a single address, returning None on failure."""
+        if existing:
+            return existing
+        
+        try:
+            return await self._geocode_one(address)
+        except httpx.HTTPError as e:
             logger.warning("Geocoding failed, using fallback", 
                           request_id=request.id, error=str(e))
+            return None
         except Exception as e:
             logger.warning("Geocoding error, using fallback", 
                           request_id=request.id, error=str(e))
+            return None
+    
+    async def _geocode_one(self, address: str) -> Optional[Location]:
+        """Look up an address with the Nominatim search API."""
+        response = await self._http.get(
+            "/search",
+            params={"q": address, "format": "json", "limit": 1}
+        )
+        response.raise_for_status()
+        
+        results = response.json()
+        if not results:
+            return None
         
-        # Check if geocoded locations are outside service area (NYC region)
-        # NYC region: roughly 40.4-41.0 latitude, -74.5 to -73.5 longitude
+        return Location(
+            latitude=float(results[0]["lat"]),
+            longitude=float(results[0]["lon"]),
+            address=address
+        )
+    
+    async def _geocode_addresses(self, request: DeliveryRequest) -> None:
+        """Convert addresses to coordinates."""
+        await self._lookup_addresses(request)
+        self._apply_location_fallbacks(request, self._in_service_area(request))
+    
+    async def _lookup_addresses(self, request: DeliveryRequest) -> None:
+        """Geocode any addresses that don't have coordinates yet."""
+        # Geocode pickup and delivery concurrently over the shared connection
+        # pool; each lookup swallows its own errors so one failure doesn't
+        # cancel the other
+        request.pickup_location, request.delivery_location = await asyncio.gather(
+            self._geocode_address(request, request.pickup_address, request.pickup_location),
+            self._geocode_address(request, request.delivery_address, request.delivery_location),
+        )
+    
+    def _in_service_area(self, request: DeliveryRequest) -> bool:
+        """Check that every geocoded location lies inside the NYC region."""
         def is_in_nyc_region(location: Location) -> bool:
-            return (40.4 <= location.latitude <= 41.0 and 
-                    -74.5 <= location.longitude <= -73.5)
+            return (NYC_LAT_MIN <= location.latitude <= NYC_LAT_MAX and 
+                    NYC_LON_MIN <= location.longitude <= NYC_LON_MAX)
         
+        return not (
+            (request.pickup_location and not is_in_nyc_region(request.pickup_location)) or
+            (request.delivery_location and not is_in_nyc_region(request.delivery_location))
+        )
+    
+    def _service_area_mask(self, requests: List[DeliveryRequest]) -> np.ndarray:
+        """Vectorized `_in_service_area` over a batch of requests."""
+        nan = float("nan")
+        coords = np.array([
+            (
+                request.pickup_location.latitude if request.pickup_location else nan,
+                request.pickup_location.longitude if request.pickup_location else nan,
+                request.delivery_location.latitude if request.delivery_location else nan,
+                request.delivery_location.longitude if request.delivery_location else nan,
+            )
+            for request in requests
+        ], dtype=np.float64).reshape(-1, 4)
+        
+        # Missing locations don't count as outside the service area
+        pickup_ok = np.isnan(coords[:, 0]) | _in_nyc_region_np(coords[:, 0], coords[:, 1])
+        delivery_ok = np.isnan(coords[:, 2]) | _in_nyc_region_np(coords[:, 2], coords[:, 3])
+        return pickup_ok & delivery_ok
+    
+    def _apply_location_fallbacks(self, request: DeliveryRequest, in_service_area: bool) -> None:
+        """Fill in fallback coordinates for out-of-area or failed geocodes."""
         # If either location is outside NYC region, use NYC fallback for both
-        if ((request.pickup_location and not is_in_nyc_region(request.pickup_location)) or
-            (request.delivery_location and not is_in_nyc_region(request.delivery_location))):
+        if not in_service_area:
             
             logger.info("Geocoded locations outside service area, using NYC fallback", 
                        request_id=request.id)
@@ -205,15 +439,40 @@ class RequestProcessor:
         logger.info("Addresses geocoded", request_id=request.id)
     
     async def _analyze_request_with_ai(self, request: DeliveryRequest) -> None:
-        """Use AI to analyze the request and provide insights."""
+        """
+        Use AI to analyze the request and explain its truck allocation.
+        
+        Both come from a single Groq call made after allocation, so the
+        model sees the truck that was chosen.
+        """
+        truck = state_manager.trucks_by_id.get(request.assigned_truck_id)
+        
         if not self.groq_client.is_available:
             logger.info("AI not available, using rule-based analysis", 
                        request_id=request.id)
             request.ai_analysis = self._rule_based_analysis(request)
+            if truck:
+                request.allocation_reasoning = f"Allocated to truck {truck.id} based on capacity and availability"
+            return
+        
+        cache_key = (self._fingerprint(request), request.assigned_truck_id)
+        cached = self._analysis_cache.get(cache_key)
+        if cached is not None:
+            analysis, reasoning = cached
+            request.ai_analysis = dict(analysis)
+            request.allocation_reasoning = reasoning
+            logger.info("AI analysis served from cache", request_id=request.id)
             return
         
         # Prepare context for AI
         context = self._prepare_ai_context(request)
+        if truck:
+            context += f"""
+        Allocated Truck: {truck.name} (ID: {truck.id})
+        Truck Status: {truck.status}
+        Truck Capacity: {truck.capacity_kg}kg
+        Current Location: {truck.current_location.address if truck.current_location else 'Unknown'}
+        """
         
         system_prompt = """
         You are an expert logistics AI assistant. Analyze delivery requests and provide:
@@ -222,32 +481,71 @@ class RequestProcessor:
         3. Special handling requirements
         4. Estimated complexity score (1-10)
         5. Key considerations for truck allocation
+        6. A brief, clear explanation of why the allocated truck is the best choice
         
         Respond in JSON format with these fields:
-        - risk_level: string
-        - recommended_priority: string  
-        - special_requirements: array of strings
-        - complexity_score: number
-        - allocation_factors: array of strings
-        - reasoning: string
+        - analysis: object with fields
+          - risk_level: string
+          - recommended_priority: string  
+          - special_requirements: array of strings
+          - complexity_score: number
+          - allocation_factors: array of strings
+          - reasoning: string
+        - allocation_reasoning: string (empty if no truck was allocated)
         """
         
         try:
-            response = self.groq_client.complete_json(
+            # The Groq client is synchronous; run it off the event loop so a
+            # batch's calls overlap
+            response = await asyncio.to_thread(
+                self.groq_client.complete_json,
                 prompt=f"Analyze this delivery request:\n{context}",
                 system_prompt=system_prompt
             )
             
-            if response.get("success") and response.get("parsed"):
-                request.ai_analysis = response["parsed"]
+            parsed = response.get("parsed") if response.get("success") else None
+            if isinstance(parsed, dict) and isinstance(parsed.get("analysis"), dict):
+                request.ai_analysis = parsed["analysis"]
+                if truck:
+                    request.allocation_reasoning = (
+                        parsed.get("allocation_reasoning")
+                        or f"Allocated to truck {truck.id} based on optimization algorithm"
+                    )
+                self._analysis_cache.set(
+                    cache_key, (dict(request.ai_analysis), request.allocation_reasoning)
+                )
                 logger.info("AI analysis completed", request_id=request.id)
             else:
-                request.ai_analysis = self._rule_based_analysis(request)
+                self._apply_analysis_fallback(request, truck)
                 
         except Exception as e:
             logger.warning("AI analysis failed, using fallback", 
                           request_id=request.id, error=str(e))
-            request.ai_analysis = self._rule_based_analysis(request)
+            self._apply_analysis_fallback(request, truck)
+    
+    def _apply_analysis_fallback(self, request: DeliveryRequest, truck: Optional[Truck]) -> None:
+        """Fill in the rule-based analysis and a generic allocation explanation."""
+        request.ai_analysis = self._rule_based_analysis(request)
+        if truck:
+            request.allocation_reasoning = f"Allocated to truck {truck.id} based on optimization algorithm"
+    
+    def _fingerprint(self, request: DeliveryRequest) -> str:
+        """Hash the fields that shape the AI analysis, ignoring ID and customer."""
+        distance = None
+        if request.pickup_location and request.delivery_location:
+            distance = round(request.pickup_location.distance_to(request.delivery_location), 1)
+        
+        key = (
+            request.description,
+            request.weight_kg,
+            request.volume_m3,
+            request.priority.value,
+            request.fragile,
+            request.temperature_controlled,
+            distance,
+            request.special_instructions or "",
+        )
+        return hashlib.sha1(repr(key).encode()).hexdigest()
     
     def _prepare_ai_context(self, request: DeliveryRequest) -> str:
         """Prepare context string for AI analysis."""
@@ -307,11 +605,9 @@ class RequestProcessor:
     
     async def _allocate_truck(self, request: DeliveryRequest) -> None:
         """Find the best truck for this request using AI-assisted allocation."""
-        available_trucks = [
-            truck for truck in state_manager.trucks 
-            if truck.status in [TruckStatus.IDLE, TruckStatus.EN_ROUTE]
-            and truck.capacity_kg >= request.weight_kg
-        ]
+        available_trucks = state_manager.get_trucks_with_capacity(
+            request.weight_kg, TruckStatus.IDLE, TruckStatus.EN_ROUTE
+        )
         
         if not available_trucks:
             logger.warning("No available trucks found", 
@@ -324,81 +620,95 @@ class RequestProcessor:
                    truck_count=len(available_trucks),
                    required_capacity=request.weight_kg)
         
-        # Create temporary load for allocation algorithm
-        temp_load = Load(
-            id=f"TEMP-{request.id}",
-            description=request.description,
-            weight_kg=request.weight_kg,
-            volume_m3=request.volume_m3,
-            priority=request.priority,
-            pickup_location=request.pickup_location,
-            delivery_location=request.delivery_location,
-            delivery_deadline=request.delivery_deadline
-        )
-        
         # Use assignment engine to find optimal allocation
         solution = self.assignment_engine.assign_loads_to_trucks(
-            available_trucks, [temp_load]
+            available_trucks, [self._temp_load(request)]
         )
         
         if solution.assignments:
-            assignment = solution.assignments[0]
-            request.assigned_truck_id = assignment.truck_id
-            
-            # Get AI reasoning for the allocation
-            await self._get_allocation_reasoning(request, assignment.truck_id)
-            
-            # Send WebSocket notification to the assigned truck
-            await self._notify_truck_assignment(request, assignment.truck_id)
-            
-            logger.info("Truck allocated", 
-                       request_id=request.id,
-                       truck_id=assignment.truck_id,
-                       cost=assignment.estimated_cost)
+            await self._apply_assignment(request, solution.assignments[0])
         else:
             logger.warning("Truck allocation failed - no valid assignments", 
                           request_id=request.id,
                           available_trucks=len(available_trucks),
                           unassigned_loads=solution.unassigned_loads)
     
-    async def _get_allocation_reasoning(self, request: DeliveryRequest, truck_id: str) -> None:
-        """Get AI explanation for truck allocation decision."""
-        if not self.groq_client.is_available:
-            request.allocation_reasoning = f"Allocated to truck {truck_id} based on capacity and availability"
-            return
-        
-        truck = next((t for t in state_manager.trucks if t.id == truck_id), None)
-        if not truck:
-            return
+    async def _allocate_trucks_batch(self, requests: List[DeliveryRequest]) -> None:
+        """
+        Allocate trucks for several requests with one assignment engine call.
         
-        context = f"""
-        Request: {request.description} ({request.weight_kg}kg, {request.priority} priority)
-        Allocated Truck: {truck.name} (ID: {truck_id})
-        Truck Status: {truck.status}
-        Truck Capacity: {truck.capacity_kg}kg
-        Current Location: {truck.current_location.address if truck.current_location else 'Unknown'}
+        The engine gives each truck at most one load per call, so requests it
+        leaves unassigned fall back to `_allocate_truck` one at a time.
         """
+        located = [
+            request for request in requests
+            if request.pickup_location and request.delivery_location
+        ]
         
-        try:
-            response = self.groq_client.complete(
-                prompt=f"Explain why this truck allocation is optimal:\n{context}",
-                system_prompt="Provide a brief, clear explanation of why this truck is the best choice for this delivery request."
-            )
-            
-            if response.get("success"):
-                request.allocation_reasoning = response["content"]
-            else:
-                request.allocation_reasoning = f"Allocated to truck {truck_id} based on optimization algorithm"
+        if located:
+            try:
+                available_trucks = state_manager.get_trucks_with_capacity(
+                    min(request.weight_kg for request in located),
+                    TruckStatus.IDLE, TruckStatus.EN_ROUTE
+                )
+                solution = self.assignment_engine.assign_loads_to_trucks(
+                    available_trucks, [self._temp_load(request) for request in located]
+                )
                 
-        except Exception as e:
-            logger.warning("Failed to get allocation reasoning", error=str(e))
-            request.allocation_reasoning = f"Allocated to truck {truck_id} based on optimization algorithm"
+                by_load_id = {f"TEMP-{request.id}": request for request in located}
+                for assignment in solution.assignments:
+                    await self._apply_assignment(by_load_id[assignment.load_id], assignment)
+                
+                logger.info("Batch allocation completed",
+                           requests=len(located),
+                           allocated=len(solution.assignments),
+                           truck_count=len(available_trucks))
+            except Exception as e:
+                # Requests the batch call did not assign are allocated one at
+                # a time below
+                logger.error("Batch allocation failed, allocating requests individually",
+                            requests=len(located),
+                            error=str(e))
+        
+        for request in requests:
+            if request.assigned_truck_id:
+                continue
+            try:
+                await self._allocate_truck(request)
+            except Exception as e:
+                logger.error("Request processing failed", 
+                            request_id=request.id, 
+                            error=str(e))
+                self.set_status(request, RequestStatus.FAILED)
+    
+    def _temp_load(self, request: DeliveryRequest) -> Load:
+        """Create a temporary load for the allocation algorithm."""
+        return Load(
+            id=f"TEMP-{request.id}",
+            description=request.description,
+            weight_kg=request.weight_kg,
+            volume_m3=request.volume_m3,
+            priority=request.priority,
+            pickup_location=request.pickup_location,
+            delivery_location=request.delivery_location,
+            delivery_deadline=request.delivery_deadline
+        )
+    
+    async def _apply_assignment(self, request: DeliveryRequest, assignment: Assignment) -> None:
+        """Record an engine assignment on the request and notify the driver."""
+        request.assigned_truck_id = assignment.truck_id
+        
+        # Send WebSocket notification to the assigned truck
+        await self._notify_truck_assignment(request, assignment.truck_id)
+        
+        logger.info("Truck allocated", 
+                   request_id=request.id,
+                   truck_id=assignment.truck_id,
+                   cost=assignment.estimated_cost)
     
     async def _notify_truck_assignment(self, request: DeliveryRequest, truck_id: str) -> None:
         """Send WebSocket notification to the assigned truck driver."""
         try:
-            from src.api.websocket import ws_manager
-            
             # Create notification message for the driver
             notification = {
                 "type": "new_assignment",
@@ -411,16 +721,20 @@ class RequestProcessor:
                 "pickup_address": request.pickup_address,
                 "delivery_address": request.delivery_address,
                 "estimated_cost": request.estimated_cost,
-                "estimated_pickup_time": request.estimated_pickup_time.isoformat() if request.estimated_pickup_time else None,
+                "estimated_pickup_time": request.estimated_pickup_time,
                 "special_instructions": request.special_instructions,
                 "fragile": request.fragile,
                 "temperature_controlled": request.temperature_controlled,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
                 "message": f"New delivery assigned: {request.description} for {request.customer_name}"
             }
             
-            # Broadcast to all connected clients (in a real app, you'd filter by truck_id)
-            await ws_manager.broadcast(notification)
+            # Serialize once with orjson (datetimes and enums are encoded natively,
+            # naive datetimes as UTC with a Z suffix)
+            # and send it to the assigned truck's driver and to the dashboards only
+            payload = orjson.dumps(notification, option=_ORJSON_NAIVE_UTC)
+            await ws_manager.send_to_truck(truck_id, payload)
+            await ws_manager.broadcast_to_dashboards(payload)
             
             logger.info("Truck assignment notification sent", 
                        request_id=request.id,
@@ -455,13 +769,13 @@ class RequestProcessor:
         )
         
         # Add to state manager
-        state_manager.loads.append(load)
+        state_manager.add_load(load)
         request.assigned_load_id = load_id
         
         # Update truck status
-        truck = next((t for t in state_manager.trucks if t.id == request.assigned_truck_id), None)
+        truck = state_manager.trucks_by_id.get(request.assigned_truck_id)
         if truck and truck.status == TruckStatus.IDLE:
-            truck.status = TruckStatus.EN_ROUTE
+            state_manager.set_truck_status(truck, TruckStatus.EN_ROUTE)
             truck.current_load_id = load_id
         
         logger.info("Load created and assigned", 
@@ -473,41 +787,53 @@ class RequestProcessor:
         if not request.pickup_location or not request.delivery_location:
             return
         
-        distance = request.pickup_location.distance_to(request.delivery_location)
-        
         # Simple cost calculation (in production, use more sophisticated pricing)
-        base_cost = 50.0  # Base fee
-        distance_cost = distance * 2.5  # Per km
-        weight_cost = request.weight_kg * 0.1  # Per kg
-        
-        priority_multiplier = {
-            LoadPriority.LOW: 0.8,
-            LoadPriority.NORMAL: 1.0,
-            LoadPriority.HIGH: 1.3,
-            LoadPriority.URGENT: 1.6,
-            LoadPriority.CRITICAL: 2.0
-        }
-        
-        request.estimated_cost = (base_cost + distance_cost + weight_cost) * priority_multiplier[request.priority]
+        cost, total_time = estimate(
+            request.pickup_location.latitude, request.pickup_location.longitude,
+            request.delivery_location.latitude, request.delivery_location.longitude,
+            request.weight_kg, PRIORITY_CODES[request.priority]
+        )
+        request.estimated_cost = cost
         
-        # Time estimates
-        avg_speed = 45  # km/h average including stops
-        travel_time_hours = distance / avg_speed
+        # Work in epoch seconds and build datetimes only for the stored fields
+        pickup_ts = time.time() + PICKUP_LEAD_HOURS * SECONDS_PER_HOUR
+        request.estimated_pickup_time = datetime.utcfromtimestamp(pickup_ts)
+        request.estimated_delivery_time = datetime.utcfromtimestamp(pickup_ts + total_time * SECONDS_PER_HOUR)
+    
+    def _calculate_estimates_batch(self, requests: List[DeliveryRequest]) -> None:
+        """Vectorized `_calculate_estimates` over a batch of requests."""
+        requests = [
+            request for request in requests
+            if request.pickup_location and request.delivery_location
+        ]
+        if not requests:
+            return
         
-        # Add buffer time based on priority
-        buffer_hours = {
-            LoadPriority.LOW: 2.0,
-            LoadPriority.NORMAL: 1.5,
-            LoadPriority.HIGH: 1.0,
-            LoadPriority.URGENT: 0.5,
-            LoadPriority.CRITICAL: 0.25
-        }
+        coords = np.array([
+            (
+                request.pickup_location.latitude, request.pickup_location.longitude,
+                request.delivery_location.latitude, request.delivery_location.longitude,
+            )
+            for request in requests
+        ], dtype=np.float64)
+        weights = np.array([request.weight_kg for request in requests], dtype=np.float64)
+        priority_codes = np.array([PRIORITY_CODES[request.priority] for request in requests])
         
-        total_time = travel_time_hours + buffer_hours[request.priority]
+        distances = _haversine_np(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3])
         
-        now = datetime.utcnow()
-        request.estimated_pickup_time = now + timedelta(hours=0.5)  # 30 min to reach pickup
-        request.estimated_delivery_time = request.estimated_pickup_time + timedelta(hours=total_time)
+        costs = (
+            (BASE_COST + distances * COST_PER_KM + weights * COST_PER_KG)
+            * np.take(_PRIORITY_MULTIPLIERS_NP, priority_codes)
+        )
+        total_hours = distances / AVG_SPEED_KMH + np.take(_BUFFER_HOURS_NP, priority_codes)
+        
+        pickup_ts = time.time() + PICKUP_LEAD_HOURS * SECONDS_PER_HOUR
+        pickup_time = datetime.utcfromtimestamp(pickup_ts)
+        delivery_ts = pickup_ts + total_hours * SECONDS_PER_HOUR
+        for request, cost, ts in zip(requests, costs.tolist(), delivery_ts.tolist()):
+            request.estimated_cost = cost
+            request.estimated_pickup_time = pickup_time
+            request.estimated_delivery_time = datetime.utcfromtimestamp(ts)
     
     def get_request(self, request_id: str) -> Optional[DeliveryRequest]:
         """Get a request by ID."""
@@ -519,7 +845,27 @@ class RequestProcessor:
     
     def get_requests_by_status(self, status: RequestStatus) -> List[DeliveryRequest]:
         """Get requests by status."""
-        return [req for req in self.requests.values() if req.status == status]
+        return list(self._by_status[status].values())
+    
+    def set_status(self, request: DeliveryRequest, status: RequestStatus) -> None:
+        """Change a request's status, keeping the status index in sync."""
+        self._by_status[request.status].pop(request.id, None)
+        request.status = status
+        self._by_status[status][request.id] = request
+        self._dirty.add(request.id)
+    
+    async def flush(self) -> None:
+        """Write requests changed since the last flush to the request store."""
+        if not self._dirty:
+            return
+        
+        dirty = [self.requests[request_id] for request_id in self._dirty if request_id in self.requests]
+        self._dirty.clear()
+        
+        try:
+            await self._store.save_many(dirty)
+        except Exception as e:
+            logger.error("Failed to persist requests", count=len(dirty), error=str(e))
     
     async def process_request(self, request_id: str) -> bool:
         """
@@ -541,9 +887,108 @@ class RequestProcessor:
                           current_status=request.status)
             return False
         
-        # Process the request
-        asyncio.create_task(self._process_request(request))
+        # Queue the request for the worker pool
+        if not self._enqueue(self._process_request, request):
+            return False
+        
+        self.set_status(request, RequestStatus.PROCESSING)
         return True
+    
+    async def process_batch(self, request_ids: List[str]) -> List[str]:
+        """
+        Trigger processing of several pending requests as one batch.
+        
+        Geocoding runs concurrently for the whole batch, and for batches of at
+        least VECTORIZE_MIN_BATCH requests the service area check and cost/time
+        estimates are computed with NumPy in a single pass.
+        
+        Args:
+            request_ids: IDs of the requests to process
+            
+        Returns:
+            List[str]: IDs of the requests that were picked up for processing
+        """
+        batch = [
+            request for request in (self.get_request(request_id) for request_id in request_ids)
+            if request and request.status == RequestStatus.PENDING
+        ]
+        if not batch:
+            return []
+        
+        if not self._enqueue(self._process_batch, batch):
+            return []
+        
+        for request in batch:
+            self.set_status(request, RequestStatus.PROCESSING)
+        
+        return [request.id for request in batch]
+    
+    def _enqueue(self, job: Callable[[Any], Awaitable[None]], arg: Any) -> bool:
+        """Queue a processing job, returning False if the queue is full."""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker()) for _ in range(REQUEST_WORKERS)
+            ]
+        
+        try:
+            self._queue.put_nowait((job, arg))
+        except asyncio.QueueFull:
+            logger.warning("Request queue full, rejecting job",
+                          queued=self._queue.qsize())
+            return False
+        return True
+    
+    async def _worker(self) -> None:
+        """Run queued processing jobs one at a time."""
+        while True:
+            job, arg = await self._queue.get()
+            try:
+                await job(arg)
+            except Exception as e:
+                logger.error("Processing job failed", error=str(e))
+            finally:
+                self._queue.task_done()
+    
+    async def open(self) -> None:
+        """Open the request store, reload previously submitted requests and create the loop-bound resources."""
+        self._http = httpx.AsyncClient(
+            base_url=NOMINATIM_BASE_URL,
+            headers={"User-Agent": "logistics-ai"},
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+        self._queue = asyncio.Queue(maxsize=REQUEST_QUEUE_MAXSIZE)
+        
+        await self._store.open()
+        
+        for request in await self._store.load_all():
+            self.requests[request.id] = request
+            self._by_status[request.status][request.id] = request
+            # Processing was interrupted by the restart; let it be triggered again
+            if request.status == RequestStatus.PROCESSING:
+                self.set_status(request, RequestStatus.PENDING)
+        
+        await self.flush()
+        logger.info("Requests loaded from store", count=len(self.requests))
+    
+    async def aclose(self) -> None:
+        """Stop the worker pool, flush the request store and close the shared HTTP client."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        
+        # Jobs still queued are dropped. Like a restart, that interrupts their
+        # processing, so let it be triggered again
+        self._queue = None
+        for request in list(self._by_status[RequestStatus.PROCESSING].values()):
+            self.set_status(request, RequestStatus.PENDING)
+        
+        await self.flush()
+        await self._store.close()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
 
 # Global instance
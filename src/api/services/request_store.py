@@ -0,0 +1,104 @@
+"""
+SQLite persistence for delivery requests.
+
+Requests are stored as orjson blobs alongside status and indexed customer
+columns, in WAL mode so reads don't block the writer. aiosqlite is optional:
+without it the store stays closed and requests live in memory only.
+"""
+import os
+from typing import List, Optional
+
+import orjson
+import structlog
+
+from src.models import DeliveryRequest
+
+try:
+    import aiosqlite
+    AIOSQLITE_AVAILABLE = True
+except ImportError:
+    aiosqlite = None
+    AIOSQLITE_AVAILABLE = False
+
+logger = structlog.get_logger(__name__)
+
+REQUESTS_DB_PATH = os.getenv("REQUESTS_DB_PATH", "requests.db")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS requests (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        customer_name TEXT NOT NULL,
+        data BLOB NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_requests_customer ON requests(customer_name)",
+)
+
+_UPSERT = """
+    INSERT INTO requests (id, status, customer_name, data) VALUES (?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        status = excluded.status,
+        customer_name = excluded.customer_name,
+        data = excluded.data
+"""
+
+
+class RequestStore:
+    """Write-through SQLite store for delivery requests."""
+
+    def __init__(self, path: str = REQUESTS_DB_PATH):
+        self.path = path
+        self._db: Optional["aiosqlite.Connection"] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Check if the database connection is open."""
+        return self._db is not None
+
+    async def open(self) -> None:
+        """Open the database and create the schema if needed."""
+        if not AIOSQLITE_AVAILABLE:
+            logger.info("aiosqlite not installed, delivery requests kept in memory only")
+            return
+
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            await self._db.execute(statement)
+        await self._db.commit()
+
+        logger.info("Request store opened", path=self.path)
+
+    async def load_all(self) -> List[DeliveryRequest]:
+        """Load every stored request."""
+        if not self._db:
+            return []
+
+        async with self._db.execute("SELECT data FROM requests") as cursor:
+            rows = await cursor.fetchall()
+        return [DeliveryRequest.model_validate_json(data) for (data,) in rows]
+
+    async def save_many(self, requests: List[DeliveryRequest]) -> None:
+        """Insert or update several requests in one transaction."""
+        if not self._db or not requests:
+            return
+
+        await self._db.executemany(_UPSERT, [
+            (
+                request.id,
+                request.status.value,
+                request.customer_name,
+                orjson.dumps(request.model_dump()),
+            )
+            for request in requests
+        ])
+        await self._db.commit()
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        if self._db:
+            await self._db.close()
+            self._db = None
@@ -6,12 +6,13 @@ Generates demo data and simulates real-time updates.
 import asyncio
 import random
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
+import numpy as np
 from src.models import (
     Truck, Route, Load, TrafficCondition, Location, GPSReading, RoutePoint,
-    Decision, TruckStatus, TrafficLevel, LoadPriority, ActionType, ControlLoopPhase
+    Decision, TruckStatus, TrafficLevel, LoadPriority, ActionType
 )
-from .state_manager import state_manager
+from .state_manager import state_manager, PHASES, PHASE_INDEX
 
 
 # NYC area coordinates for simulation
@@ -30,6 +31,9 @@ NYC_LOCATIONS = [
     {"name": "Queens Depot", "lat": 40.7282, "lng": -73.7949},
 ]
 
+# Statuses counted as issues in control loop updates
+ISSUE_STATUSES = frozenset({TruckStatus.STUCK, TruckStatus.DELAYED})
+
 TRUCK_NAMES = [
     "Alpha Express", "Beta Logistics", "Gamma Transport", "Delta Freight",
     "Echo Shipping", "Foxtrot Cargo", "Golf Haulers", "Hotel Transit",
@@ -48,72 +52,105 @@ class SimulationService:
         """Generate initial fleet data."""
         state_manager.reset()
 
-        # Generate trucks
+        rng = np.random.default_rng()
+        now = datetime.utcnow()
+
+        # Generate trucks. Every random field is drawn for the whole fleet in
+        # one vectorized call, and the models are built without validation
+        # since the values come from known ranges
         statuses = [
             TruckStatus.EN_ROUTE, TruckStatus.EN_ROUTE, TruckStatus.EN_ROUTE,
             TruckStatus.EN_ROUTE, TruckStatus.LOADING, TruckStatus.UNLOADING,
             TruckStatus.IDLE, TruckStatus.IDLE, TruckStatus.DELAYED, TruckStatus.STUCK
         ]
 
-        for i in range(min(num_trucks, len(TRUCK_NAMES))):
-            loc_data = random.choice(NYC_LOCATIONS)
-            location = Location(
-                latitude=loc_data["lat"] + random.uniform(-0.01, 0.01),
-                longitude=loc_data["lng"] + random.uniform(-0.01, 0.01),
+        n = min(num_trucks, len(TRUCK_NAMES))
+        loc_idx = rng.integers(0, len(NYC_LOCATIONS), n).tolist()
+        lat_jitter = rng.uniform(-0.01, 0.01, n).tolist()
+        lng_jitter = rng.uniform(-0.01, 0.01, n).tolist()
+        capacity = rng.choice([10000, 12000, 15000, 18000, 20000], n).tolist()
+        fuel = rng.uniform(20, 100, n).tolist()
+        gps_age_minutes = rng.integers(1, 11, n).tolist()
+        speed = rng.uniform(0, 65, n).tolist()
+        heading = rng.uniform(0, 360, n).tolist()
+        accuracy = rng.uniform(3, 15, n).tolist()
+        distance = rng.uniform(5000, 25000, n).tolist()
+        deliveries = rng.integers(30, 151, n).tolist()
+
+        for i in range(n):
+            loc_data = NYC_LOCATIONS[loc_idx[i]]
+            location = Location.model_construct(
+                latitude=loc_data["lat"] + lat_jitter[i],
+                longitude=loc_data["lng"] + lng_jitter[i],
                 address=f"{loc_data['name']}, New York, NY",
                 name=loc_data["name"]
             )
 
+            truck_id = f"TRK-{i+1:03d}"
             status = statuses[i % len(statuses)]
-            truck = Truck(
-                id=f"TRK-{i+1:03d}",
+            truck = Truck.model_construct(
+                id=truck_id,
                 name=TRUCK_NAMES[i],
                 status=status,
                 current_location=location,
                 driver_id=f"DRV-{i+1:03d}",
-                capacity_kg=random.choice([10000, 12000, 15000, 18000, 20000]),
-                fuel_level_percent=random.uniform(20, 100),
+                capacity_kg=capacity[i],
+                fuel_level_percent=fuel[i],
                 current_load_id=f"LOAD-{i+1:03d}" if status in [TruckStatus.EN_ROUTE, TruckStatus.DELAYED] else None,
-                last_gps_reading=GPSReading(
-                    truck_id=f"TRK-{i+1:03d}",
-                    timestamp=datetime.utcnow() - timedelta(minutes=random.randint(1, 10)),
+                last_gps_reading=GPSReading.model_construct(
+                    truck_id=truck_id,
+                    timestamp=now - timedelta(minutes=gps_age_minutes[i]),
                     location=location,
-                    speed_kmh=random.uniform(0, 65) if status == TruckStatus.EN_ROUTE else 0,
-                    heading=random.uniform(0, 360),
-                    accuracy_meters=random.uniform(3, 15)
+                    speed_kmh=speed[i] if status == TruckStatus.EN_ROUTE else 0,
+                    heading=heading[i],
+                    accuracy_meters=accuracy[i]
                 ),
-                total_distance_km=random.uniform(5000, 25000),
-                total_deliveries=random.randint(30, 150)
+                total_distance_km=distance[i],
+                total_deliveries=deliveries[i]
             )
-            state_manager.trucks.append(truck)
+            state_manager.add_truck(truck)
 
         # Generate loads
-        for i in range(15):
-            pickup = random.choice(NYC_LOCATIONS)
-            delivery = random.choice([l for l in NYC_LOCATIONS if l != pickup])
-
-            load = Load(
+        num_loads = 15
+        priorities = list(LoadPriority)
+        pickup_idx = rng.integers(0, len(NYC_LOCATIONS), num_loads)
+        # Draw from the other locations by skipping over the pickup index
+        delivery_idx = rng.integers(0, len(NYC_LOCATIONS) - 1, num_loads)
+        delivery_idx = (delivery_idx + (delivery_idx >= pickup_idx)).tolist()
+        pickup_idx = pickup_idx.tolist()
+        weight = rng.uniform(500, 8000, num_loads).tolist()
+        volume = rng.uniform(5, 50, num_loads).tolist()
+        priority_idx = rng.integers(0, len(priorities), num_loads).tolist()
+        window_start = rng.integers(0, 5, num_loads).tolist()
+        window_end = rng.integers(5, 9, num_loads).tolist()
+        deadline = rng.integers(12, 49, num_loads).tolist()
+
+        for i in range(num_loads):
+            pickup = NYC_LOCATIONS[pickup_idx[i]]
+            delivery = NYC_LOCATIONS[delivery_idx[i]]
+
+            load = Load.model_construct(
                 id=f"LOAD-{i+1:03d}",
                 description=f"Cargo shipment #{i+1:03d}",
-                weight_kg=random.uniform(500, 8000),
-                volume_m3=random.uniform(5, 50),
-                priority=random.choice(list(LoadPriority)),
-                pickup_location=Location(
+                weight_kg=weight[i],
+                volume_m3=volume[i],
+                priority=priorities[priority_idx[i]],
+                pickup_location=Location.model_construct(
                     latitude=pickup["lat"],
                     longitude=pickup["lng"],
                     address=f"{pickup['name']}, New York, NY"
                 ),
-                delivery_location=Location(
+                delivery_location=Location.model_construct(
                     latitude=delivery["lat"],
                     longitude=delivery["lng"],
                     address=f"{delivery['name']}, New York, NY"
                 ),
-                pickup_window_start=datetime.utcnow() + timedelta(hours=random.randint(0, 4)),
-                pickup_window_end=datetime.utcnow() + timedelta(hours=random.randint(5, 8)),
-                delivery_deadline=datetime.utcnow() + timedelta(hours=random.randint(12, 48)),
+                pickup_window_start=now + timedelta(hours=window_start[i]),
+                pickup_window_end=now + timedelta(hours=window_end[i]),
+                delivery_deadline=now + timedelta(hours=deadline[i]),
                 assigned_truck_id=f"TRK-{i+1:03d}" if i < 5 else None
             )
-            state_manager.loads.append(load)
+            state_manager.add_load(load)
 
         # Generate traffic conditions
         traffic_segments = [
@@ -133,21 +170,31 @@ class SimulationService:
                 delay_minutes=random.uniform(0, 30),
                 incident_description="Heavy traffic due to construction" if level == TrafficLevel.HEAVY else None,
                 affected_routes=[f"ROUTE-{random.randint(1,5):03d}"],
-                timestamp=datetime.utcnow()
+                timestamp=now
             )
             state_manager.traffic_conditions.append(traffic)
 
         # Initialize control loop state
         state_manager.total_cycles = random.randint(1000, 2000)
-        state_manager.cycle_durations = [random.uniform(800, 1200) for _ in range(50)]
-
-    async def start_background_updates(self, websocket_broadcast=None):
-        """Start background tasks for simulation updates."""
+        for _ in range(50):
+            state_manager.record_cycle_duration(random.uniform(800, 1200))
+
+    async def start_background_updates(
+        self,
+        websocket_broadcast=None,
+        has_subscribers: Optional[Callable[[], bool]] = None
+    ):
+        """
+        Start background tasks for simulation updates.
+
+        has_subscribers, if given, is checked before each broadcast so the
+        payload isn't built when nobody is listening.
+        """
         self._update_task = asyncio.create_task(
-            self._position_update_loop(websocket_broadcast)
+            self._position_update_loop(websocket_broadcast, has_subscribers)
         )
         self._decision_task = asyncio.create_task(
-            self._decision_generation_loop(websocket_broadcast)
+            self._decision_generation_loop(websocket_broadcast, has_subscribers)
         )
 
     async def stop_background_updates(self):
@@ -166,12 +213,17 @@ class SimulationService:
             except asyncio.CancelledError:
                 pass
 
-    async def _position_update_loop(self, broadcast=None):
+    async def _position_update_loop(self, broadcast=None, has_subscribers=None):
         """Update truck positions periodically."""
         while True:
             try:
                 await asyncio.sleep(5)  # Update every 5 seconds
 
+                listening = broadcast is not None and (has_subscribers is None or has_subscribers())
+
+                # All moved trucks go out in one frame per tick and share its timestamp
+                now = datetime.utcnow()
+                updates = []
                 for truck in state_manager.trucks:
                     if truck.status == TruckStatus.EN_ROUTE and truck.current_location:
                         # Small random movement
@@ -181,49 +233,53 @@ class SimulationService:
                         truck.current_location.latitude += lat_change
                         truck.current_location.longitude += lng_change
 
-                        truck.last_gps_reading = GPSReading(
+                        # Generated readings are trusted, so skip validation
+                        truck.last_gps_reading = GPSReading.model_construct(
                             truck_id=truck.id,
-                            timestamp=datetime.utcnow(),
+                            timestamp=now,
                             location=truck.current_location,
                             speed_kmh=random.uniform(30, 70),
                             heading=random.uniform(0, 360),
                             accuracy_meters=random.uniform(3, 10)
                         )
 
-                        # Broadcast update via WebSocket
-                        if broadcast:
-                            await broadcast({
-                                "type": "truck_location_update",
-                                "data": {
-                                    "truck_id": truck.id,
-                                    "location": {
-                                        "latitude": truck.current_location.latitude,
-                                        "longitude": truck.current_location.longitude
-                                    },
-                                    "speed_kmh": truck.last_gps_reading.speed_kmh,
-                                    "heading": truck.last_gps_reading.heading,
-                                    "timestamp": truck.last_gps_reading.timestamp.isoformat()
+                        if listening:
+                            updates.append({
+                                "truck_id": truck.id,
+                                "location": {
+                                    "latitude": truck.current_location.latitude,
+                                    "longitude": truck.current_location.longitude
                                 },
-                                "timestamp": datetime.utcnow().isoformat(),
-                                "source": "fleet_manager"
+                                "speed_kmh": truck.last_gps_reading.speed_kmh,
+                                "heading": truck.last_gps_reading.heading,
+                                "timestamp": truck.last_gps_reading.timestamp
                             })
 
+                # Broadcast updates via WebSocket
+                if updates:
+                    await broadcast({
+                        "type": "truck_location_batch",
+                        "data": updates,
+                        "timestamp": now,
+                        "source": "fleet_manager"
+                    })
+
                 # Update control loop phase if running
                 if state_manager.control_loop_running:
                     state_manager.advance_phase()
                     state_manager.record_cycle_duration(random.uniform(800, 1200))
 
-                    if broadcast:
+                    if listening:
                         await broadcast({
                             "type": "control_loop_update",
                             "data": {
                                 "cycle_id": state_manager.cycle_id,
                                 "phase": state_manager.current_phase.value,
-                                "progress_percent": (list(ControlLoopPhase).index(state_manager.current_phase) + 1) / len(ControlLoopPhase) * 100,
-                                "issues_detected": len([t for t in state_manager.trucks if t.status in [TruckStatus.STUCK, TruckStatus.DELAYED]]),
+                                "progress_percent": (PHASE_INDEX[state_manager.current_phase] + 1) / len(PHASES) * 100,
+                                "issues_detected": sum(1 for t in state_manager.trucks if t.status in ISSUE_STATUSES),
                                 "decisions_pending": len(state_manager.pending_decisions)
                             },
-                            "timestamp": datetime.utcnow().isoformat(),
+                            "timestamp": now,
                             "source": "control_loop"
                         })
 
@@ -233,7 +289,7 @@ class SimulationService:
                 print(f"Error in position update loop: {e}")
                 await asyncio.sleep(1)
 
-    async def _decision_generation_loop(self, broadcast=None):
+    async def _decision_generation_loop(self, broadcast=None, has_subscribers=None):
         """Generate sample decisions periodically."""
         decision_counter = 0
 
@@ -248,8 +304,17 @@ class SimulationService:
                 action_type = random.choice(list(ActionType))
                 truck = random.choice(state_manager.trucks) if state_manager.trucks else None
 
-                decision = Decision(
-                    id=f"DEC-{int(datetime.utcnow().timestamp())}-{decision_counter}",
+                confidence = random.uniform(0.75, 0.98)
+                llm_verified = random.choice([True, True, False])
+                rationale = f"AI detected opportunity for {action_type.value} optimization"
+                # Auto-approve high confidence decisions
+                human_approved = confidence > 0.9 and llm_verified
+                now = datetime.utcnow()
+                decision_id = f"DEC-{int(now.timestamp())}-{decision_counter}"
+
+                # Every field is generated here, so skip validation
+                decision = Decision.model_construct(
+                    id=decision_id,
                     scenario_id=f"SCN-{decision_counter:03d}",
                     action_type=action_type,
                     parameters={
@@ -263,31 +328,30 @@ class SimulationService:
                         ])
                     },
                     score=random.uniform(0.7, 0.99),
-                    confidence=random.uniform(0.75, 0.98),
-                    rationale=f"AI detected opportunity for {action_type.value} optimization",
-                    llm_verified=random.choice([True, True, False]),
-                    decided_at=datetime.utcnow()
+                    confidence=confidence,
+                    rationale=rationale,
+                    llm_verified=llm_verified,
+                    human_approved=human_approved,
+                    decided_at=now
                 )
 
-                # Auto-approve high confidence decisions
-                if decision.confidence > 0.9 and decision.llm_verified:
-                    decision.human_approved = True
-                    state_manager.approved_decisions.append(decision)
+                if human_approved:
+                    state_manager.add_approved_decision(decision)
                 else:
                     state_manager.add_pending_decision(decision)
 
-                if broadcast:
+                if broadcast is not None and (has_subscribers is None or has_subscribers()):
                     await broadcast({
                         "type": "decision_pending",
                         "data": {
-                            "decision_id": decision.id,
-                            "action_type": decision.action_type.value,
-                            "description": decision.rationale,
-                            "confidence": decision.confidence,
-                            "requires_approval": not decision.human_approved,
-                            "auto_execute_in_seconds": 30 if decision.llm_verified else None
+                            "decision_id": decision_id,
+                            "action_type": action_type.value,
+                            "description": rationale,
+                            "confidence": confidence,
+                            "requires_approval": not human_approved,
+                            "auto_execute_in_seconds": 30 if llm_verified else None
                         },
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": now,
                         "source": "decision_engine"
                     })
 
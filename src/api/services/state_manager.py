@@ -1,10 +1,13 @@
 """
 State management service for the Logistics AI Dashboard.
-Singleton class that manages in-memory system state.
+Manages in-memory system state through a single module-level instance.
 """
 
 import asyncio
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict, deque
 from datetime import datetime
+from itertools import chain
 from typing import Optional
 from src.models import (
     Truck, Route, Load, TrafficCondition, Decision,
@@ -12,34 +15,37 @@ from src.models import (
 )
 
 
+# Number of recent cycle durations kept for the average
+CYCLE_HISTORY = 100
+
+# Number of approved/rejected decisions included in the pending response
+RECENT_DECISIONS = 10
+
+# Control loop phase order, built once rather than on every phase change
+PHASES = list(ControlLoopPhase)
+PHASE_INDEX = {phase: i for i, phase in enumerate(PHASES)}
+NEXT_PHASE = {phase: PHASES[(i + 1) % len(PHASES)] for i, phase in enumerate(PHASES)}
+
+
 class StateManager:
     """
-    Singleton class managing system state.
+    In-memory system state, shared through the module-level state_manager.
     Tracks trucks, routes, loads, traffic, decisions, and control loop state.
     """
 
-    _instance: Optional["StateManager"] = None
-
-    def __new__(cls) -> "StateManager":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-
     def __init__(self):
-        if self._initialized:
-            return
-
         # Fleet state
-        self.trucks: list[Truck] = []
+        self._clear_trucks()
         self.routes: list[Route] = []
-        self.loads: list[Load] = []
+        self._clear_loads()
         self.traffic_conditions: list[TrafficCondition] = []
 
         # Decision state
-        self.pending_decisions: list[Decision] = []
+        # Pending decisions keyed by ID, in insertion order
+        self._pending: dict[str, Decision] = {}
         self.approved_decisions: list[Decision] = []
         self.rejected_decisions: list[Decision] = []
+        self._clear_decision_dumps()
 
         # Control loop state
         self.control_loop_running: bool = False
@@ -48,72 +54,152 @@ class StateManager:
         self.cycle_id: str = ""
         self.loop_start_time: Optional[datetime] = None
         self.last_cycle_duration_ms: float = 0
-        self.cycle_durations: list[float] = []
+        # Only the last CYCLE_HISTORY durations are kept
+        self.cycle_durations: deque[float] = deque(maxlen=CYCLE_HISTORY)
+        # Running total of cycle_durations, maintained by record_cycle_duration
+        self._cycle_sum: float = 0.0
 
         # Background task reference
         self._loop_task: Optional[asyncio.Task] = None
 
-        self._initialized = True
-
     def reset(self):
         """Reset state to initial values."""
-        self.trucks = []
+        self._clear_trucks()
         self.routes = []
-        self.loads = []
+        self._clear_loads()
         self.traffic_conditions = []
-        self.pending_decisions = []
+        self._pending = {}
         self.approved_decisions = []
         self.rejected_decisions = []
+        self._clear_decision_dumps()
         self.control_loop_running = False
         self.current_phase = ControlLoopPhase.OBSERVE
         self.total_cycles = 0
         self.cycle_id = ""
         self.loop_start_time = None
         self.last_cycle_duration_ms = 0
-        self.cycle_durations = []
+        self.cycle_durations = deque(maxlen=CYCLE_HISTORY)
+        self._cycle_sum = 0.0
 
     # =========================================================================
     # Fleet Management
     # =========================================================================
 
+    def _clear_trucks(self):
+        """Empty the fleet and its indexes."""
+        self.trucks: list[Truck] = []
+        # Indexes over self.trucks, maintained by add_truck/set_trucks/set_truck_status
+        self.trucks_by_id: dict[str, Truck] = {}
+        self.trucks_by_status: defaultdict[TruckStatus, dict[str, Truck]] = defaultdict(dict)
+        # Trucks sorted by capacity, with a parallel list of keys for bisect
+        self._trucks_by_capacity: list[Truck] = []
+        self._capacity_keys: list[float] = []
+
+    def add_truck(self, truck: Truck):
+        """Add a truck to the fleet."""
+        self.trucks.append(truck)
+        self.trucks_by_id[truck.id] = truck
+        self.trucks_by_status[truck.status][truck.id] = truck
+
+        idx = bisect_right(self._capacity_keys, truck.capacity_kg)
+        self._capacity_keys.insert(idx, truck.capacity_kg)
+        self._trucks_by_capacity.insert(idx, truck)
+
+    def set_trucks(self, trucks: list[Truck]):
+        """Replace the whole fleet."""
+        self._clear_trucks()
+        for truck in trucks:
+            self.add_truck(truck)
+
+    def set_truck_status(self, truck: Truck, status: TruckStatus):
+        """Change a truck's status, keeping the status index in sync."""
+        self.trucks_by_status[truck.status].pop(truck.id, None)
+        truck.status = status
+        self.trucks_by_status[status][truck.id] = truck
+
+    def get_trucks_by_status(self, *statuses: TruckStatus) -> list[Truck]:
+        """Get all trucks in any of the given statuses."""
+        return list(chain.from_iterable(
+            self.trucks_by_status[status].values() for status in statuses
+        ))
+
+    def get_trucks_with_capacity(self, min_capacity_kg: float, *statuses: TruckStatus) -> list[Truck]:
+        """Get trucks in any of the given statuses that can carry min_capacity_kg."""
+        idx = bisect_left(self._capacity_keys, min_capacity_kg)
+        return [
+            truck for truck in self._trucks_by_capacity[idx:]
+            if truck.status in statuses
+        ]
+
     def get_truck(self, truck_id: str) -> Optional[Truck]:
         """Get a truck by ID."""
-        for truck in self.trucks:
-            if truck.id == truck_id:
-                return truck
-        return None
+        return self.trucks_by_id.get(truck_id)
 
     def update_truck(self, truck_id: str, **updates) -> Optional[Truck]:
         """Update a truck's properties."""
         truck = self.get_truck(truck_id)
         if truck:
             for key, value in updates.items():
-                if hasattr(truck, key):
+                if key == "status":
+                    self.set_truck_status(truck, value)
+                elif hasattr(truck, key):
                     setattr(truck, key, value)
+
+            if "capacity_kg" in updates:
+                self.set_trucks(self.trucks)
         return truck
 
+    def _clear_loads(self):
+        """Empty the load list and its ID index."""
+        self.loads: list[Load] = []
+        # Index over self.loads, maintained by add_load/add_loads/set_loads
+        self.loads_by_id: dict[str, Load] = {}
+
+    def add_load(self, load: Load):
+        """Add a load."""
+        self.loads.append(load)
+        self.loads_by_id[load.id] = load
+
+    def add_loads(self, loads: list[Load]):
+        """Add several loads."""
+        for load in loads:
+            self.add_load(load)
+
+    def set_loads(self, loads: list[Load]):
+        """Replace all loads."""
+        self._clear_loads()
+        self.add_loads(loads)
+
+    def get_load(self, load_id: str) -> Optional[Load]:
+        """Get a load by ID."""
+        return self.loads_by_id.get(load_id)
+
     def get_fleet_summary(self) -> dict:
         """Get summary statistics for the fleet."""
         total = len(self.trucks)
-        en_route = sum(1 for t in self.trucks if t.status == TruckStatus.EN_ROUTE)
-        loading = sum(1 for t in self.trucks if t.status == TruckStatus.LOADING)
-        unloading = sum(1 for t in self.trucks if t.status == TruckStatus.UNLOADING)
-        idle = sum(1 for t in self.trucks if t.status == TruckStatus.IDLE)
-        maintenance = sum(1 for t in self.trucks if t.status == TruckStatus.MAINTENANCE)
-        stuck = sum(1 for t in self.trucks if t.status == TruckStatus.STUCK)
-        delayed = sum(1 for t in self.trucks if t.status == TruckStatus.DELAYED)
-
-        # Calculate loads summary
+        # One pass over the fleet for every status count
+        statuses = Counter(t.status for t in self.trucks)
+
+        # Calculate loads summary in a single pass
         total_loads = len(self.loads)
-        pending_loads = sum(1 for l in self.loads if l.assigned_truck_id is None)
-        in_transit = sum(1 for l in self.loads if l.picked_up_at and not l.delivered_at)
-        delivered = sum(1 for l in self.loads if l.delivered_at)
+        pending_loads = in_transit = delivered = 0
+        for l in self.loads:
+            if l.assigned_truck_id is None:
+                pending_loads += 1
+            if l.delivered_at:
+                delivered += 1
+            elif l.picked_up_at:
+                in_transit += 1
 
         return {
             "total_trucks": total,
-            "active_trucks": en_route + loading + unloading,
-            "idle_trucks": idle,
-            "trucks_with_issues": stuck + delayed,
+            "active_trucks": (
+                statuses[TruckStatus.EN_ROUTE]
+                + statuses[TruckStatus.LOADING]
+                + statuses[TruckStatus.UNLOADING]
+            ),
+            "idle_trucks": statuses[TruckStatus.IDLE],
+            "trucks_with_issues": statuses[TruckStatus.STUCK] + statuses[TruckStatus.DELAYED],
             "total_loads": total_loads,
             "pending_loads": pending_loads,
             "in_transit_loads": in_transit,
@@ -132,7 +218,7 @@ class StateManager:
 
         avg_duration = 0
         if self.cycle_durations:
-            avg_duration = sum(self.cycle_durations) / len(self.cycle_durations)
+            avg_duration = self._cycle_sum / len(self.cycle_durations)
 
         cycles_per_minute = 0
         if avg_duration > 0:
@@ -144,7 +230,7 @@ class StateManager:
                 "cycle_id": self.cycle_id,
                 "total_cycles": self.total_cycles,
                 "continue_loop": self.control_loop_running,
-                "requires_human_intervention": len(self.pending_decisions) > 0,
+                "requires_human_intervention": len(self._pending) > 0,
             },
             "is_running": self.control_loop_running,
             "last_cycle_duration_ms": self.last_cycle_duration_ms,
@@ -165,57 +251,70 @@ class StateManager:
 
     def advance_phase(self):
         """Advance to the next phase in the control loop."""
-        phases = list(ControlLoopPhase)
-        current_idx = phases.index(self.current_phase)
-        next_idx = (current_idx + 1) % len(phases)
-        self.current_phase = phases[next_idx]
+        self.current_phase = NEXT_PHASE[self.current_phase]
 
         # If we completed a full cycle
-        if next_idx == 0:
+        if self.current_phase is PHASES[0]:
             self.total_cycles += 1
             self.cycle_id = f"CYCLE-{int(datetime.utcnow().timestamp())}"
 
     def record_cycle_duration(self, duration_ms: float):
         """Record a cycle duration."""
         self.last_cycle_duration_ms = duration_ms
+        if len(self.cycle_durations) == self.cycle_durations.maxlen:
+            self._cycle_sum -= self.cycle_durations[0]
         self.cycle_durations.append(duration_ms)
-        # Keep only last 100 durations
-        if len(self.cycle_durations) > 100:
-            self.cycle_durations = self.cycle_durations[-100:]
+        self._cycle_sum += duration_ms
 
     # =========================================================================
     # Decision Management
     # =========================================================================
 
+    def _clear_decision_dumps(self):
+        """Empty the cached model_dump() output used by get_pending_decisions_response."""
+        # Decisions are dumped once when they enter a list, not on every poll
+        self._pending_dumps: dict[str, dict] = {}
+        self._approved_dumps: deque[dict] = deque(maxlen=RECENT_DECISIONS)
+        self._rejected_dumps: deque[dict] = deque(maxlen=RECENT_DECISIONS)
+
+    @property
+    def pending_decisions(self) -> list[Decision]:
+        """Pending decisions, oldest first."""
+        return list(self._pending.values())
+
     def add_pending_decision(self, decision: Decision):
         """Add a decision to pending list."""
-        self.pending_decisions.append(decision)
+        self._pending[decision.id] = decision
+        self._pending_dumps[decision.id] = decision.model_dump()
+
+    def add_approved_decision(self, decision: Decision):
+        """Record a decision that was approved without going through the pending list."""
+        self.approved_decisions.append(decision)
+        self._approved_dumps.append(decision.model_dump())
 
     def approve_decision(self, decision_id: str, approved: bool = True) -> Optional[Decision]:
         """Approve or reject a pending decision."""
-        for i, decision in enumerate(self.pending_decisions):
-            if decision.id == decision_id:
-                decision.human_approved = approved
-                self.pending_decisions.pop(i)
-                if approved:
-                    self.approved_decisions.append(decision)
-                else:
-                    self.rejected_decisions.append(decision)
-                return decision
-        return None
+        decision = self._pending.pop(decision_id, None)
+        if decision:
+            self._pending_dumps.pop(decision_id, None)
+            decision.human_approved = approved
+            if approved:
+                self.add_approved_decision(decision)
+            else:
+                self.rejected_decisions.append(decision)
+                self._rejected_dumps.append(decision.model_dump())
+        return decision
 
     def get_pending_decisions_response(self) -> dict:
         """Get pending decisions response."""
+        pending = list(self._pending_dumps.values())
         return {
-            "decisions": [d.model_dump() for d in self.pending_decisions],
-            "requires_human_approval": [
-                d.model_dump() for d in self.pending_decisions
-                if not d.llm_verified
-            ],
-            "auto_approved": [d.model_dump() for d in self.approved_decisions[-10:]],
-            "rejected": [d.model_dump() for d in self.rejected_decisions[-10:]],
+            "decisions": pending,
+            "requires_human_approval": [d for d in pending if not d["llm_verified"]],
+            "auto_approved": list(self._approved_dumps),
+            "rejected": list(self._rejected_dumps),
         }
 
 
-# Global singleton instance
+# Global instance
 state_manager = StateManager()
@@ -2,60 +2,169 @@
 WebSocket connection manager for real-time updates.
 """
 
-import json
+import asyncio
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
+import orjson
 from fastapi import WebSocket
 
+# Larger fan-outs are queued in chunks of this many clients, yielding to the
+# event loop between chunks so other coroutines aren't starved
+BROADCAST_BATCH_SIZE = 50
+
+# Messages waiting per client; a client that falls this far behind is dropped
+SEND_QUEUE_MAXSIZE = 64
+
+# The server runs with permessage-deflate disabled (--ws-per-message-deflate
+# false): a broadcast is encoded once and the same str is handed to every
+# writer, so nothing is recompressed per client. Frames stay text because
+# the dashboards JSON.parse them
+
+# Non-string keys are stringified like the stdlib json module would, and
+# datetimes (naive ones being UTC) are encoded as ISO 8601 with a Z suffix
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _dumps(message: dict[str, Any]) -> str:
+    """Serialize a message with orjson, falling back to str() for unknown types."""
+    return orjson.dumps(message, default=str, option=_ORJSON_OPTIONS).decode()
+
 
 class ConnectionManager:
     """
     Manages WebSocket connections and broadcasts events to all connected clients.
+    Messages are queued per connection and sent by one writer task per client.
     """
 
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
+        # Targeted delivery: driver apps keyed by the truck they subscribed
+        # for, everything else (dashboards) in a separate set
+        self._by_truck: dict[str, set[WebSocket]] = {}
+        self._truck_of: dict[WebSocket, str] = {}
+        self._dashboards: set[WebSocket] = set()
+        # Each connection has its own send queue drained by a writer task,
+        # so broadcasting never waits on a client's network I/O
+        self._queues: dict[WebSocket, asyncio.Queue] = {}
+        self._writers: dict[WebSocket, asyncio.Task] = {}
+        # Close tasks for dropped clients, held until done so they aren't
+        # garbage-collected before they run
+        self._closing: set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket):
         """Accept a new WebSocket connection."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        self.register(websocket)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_MAXSIZE)
+        self._queues[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
         print(f"WebSocket connected. Total connections: {len(self.active_connections)}")
 
+    def register(self, websocket: WebSocket, truck_id: Optional[str] = None):
+        """
+        Record who a connection belongs to.
+
+        Connections start out as dashboards; a driver app that subscribes
+        with a truck_id is moved to that truck.
+        """
+        self._unregister(websocket)
+        if truck_id:
+            self._by_truck.setdefault(truck_id, set()).add(websocket)
+            self._truck_of[websocket] = truck_id
+        else:
+            self._dashboards.add(websocket)
+
+    def _unregister(self, websocket: WebSocket):
+        """Drop a connection from the truck and dashboard indexes."""
+        self._dashboards.discard(websocket)
+        truck_id = self._truck_of.pop(websocket, None)
+        if truck_id is not None:
+            drivers = self._by_truck.get(truck_id)
+            if drivers is not None:
+                drivers.discard(websocket)
+                if not drivers:
+                    del self._by_truck[truck_id]
+
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self._unregister(websocket)
+
+        self._queues.pop(websocket, None)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
         print(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
     async def send_personal_message(self, message: dict[str, Any], websocket: WebSocket):
         """Send a message to a specific client."""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            print(f"Error sending personal message: {e}")
-            self.disconnect(websocket)
+        await self._send_text_to((websocket,), _dumps(message))
 
     async def broadcast(self, message: dict[str, Any]):
         """Broadcast a message to all connected clients."""
         if not self.active_connections:
             return
 
-        # Ensure message has required fields
-        if "timestamp" not in message:
-            message["timestamp"] = datetime.utcnow().isoformat()
+        # Callers always stamp the message. Serialize once for every client
+        # rather than once per send_json
+        await self._send_text_to(self.active_connections, _dumps(message))
+
+    async def send_to_truck(self, truck_id: str, payload: bytes):
+        """Send a pre-serialized JSON payload to the driver apps of one truck."""
+        await self._send_text_to(self._by_truck.get(truck_id, ()), payload.decode())
+
+    async def broadcast_to_dashboards(self, payload: bytes):
+        """Send a pre-serialized JSON payload to every non-driver client."""
+        await self._send_text_to(self._dashboards, payload.decode())
+
+    async def _send_text_to(self, connections, text: str):
+        """Queue a text frame for each of the given connections."""
+        if not connections:
+            return
+
+        # Snapshot the connections: dropping a client mutates the sets. Yielding
+        # after each chunk also lets the writers drain during bursts, so only
+        # clients that really stall fill their queues
+        connections = list(connections)
+        for start in range(0, len(connections), BROADCAST_BATCH_SIZE):
+            for connection in connections[start:start + BROADCAST_BATCH_SIZE]:
+                queue = self._queues.get(connection)
+                if queue is None:
+                    continue
+                try:
+                    queue.put_nowait(text)
+                except asyncio.QueueFull:
+                    print("Client send queue full, dropping slow client")
+                    self._drop(connection)
+            await asyncio.sleep(0)
 
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(f"Error broadcasting to client: {e}")
-                disconnected.append(connection)
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued messages to one client until it disconnects."""
+        try:
+            while True:
+                text = await queue.get()
+                await websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error sending to client: {e}")
+            self.disconnect(websocket)
 
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+    def _drop(self, websocket: WebSocket):
+        """Disconnect a client that can't keep up and close its socket."""
+        self.disconnect(websocket)
+        task = asyncio.create_task(self._close(websocket))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket):
+        """Close a socket, ignoring errors from one that is already gone."""
+        try:
+            await websocket.close()
+        except Exception:
+            pass
 
     async def broadcast_truck_location_update(
         self,
@@ -66,6 +175,7 @@ class ConnectionManager:
         heading: float
     ):
         """Broadcast a truck location update event."""
+        now = datetime.utcnow()
         await self.broadcast({
             "type": "truck_location_update",
             "data": {
@@ -76,9 +186,9 @@ class ConnectionManager:
                 },
                 "speed_kmh": speed_kmh,
                 "heading": heading,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now
             },
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": now,
             "source": "fleet_manager"
         })
 
@@ -100,7 +210,7 @@ class ConnectionManager:
                 "issues_detected": issues_detected,
                 "decisions_pending": decisions_pending
             },
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "source": "control_loop"
         })
 
@@ -116,7 +226,7 @@ class ConnectionManager:
                 "current_phase": phase,
                 "previous_phase": previous_phase
             },
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "source": "control_loop"
         })
 
@@ -138,10 +248,14 @@ class ConnectionManager:
                 "confidence": confidence,
                 "requires_approval": requires_approval
             },
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.utcnow(),
             "source": "decision_engine"
         })
 
+    def has_clients(self) -> bool:
+        """Check if any client is connected, before building a message for broadcast()."""
+        return bool(self.active_connections)
+
     @property
     def connection_count(self) -> int:
         """Get the number of active connections."""
@@ -1,5 +1,5 @@
 """Decision layer for scenario evaluation and selection."""
-from .evaluator import DecisionEvaluator
+from .evaluator import DecisionEvaluator, ScenarioBatch
 from .decision_node import create_decision_node
 
-__all__ = ["DecisionEvaluator", "create_decision_node"]
+__all__ = ["DecisionEvaluator", "ScenarioBatch", "create_decision_node"]
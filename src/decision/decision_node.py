@@ -4,8 +4,8 @@ LangGraph decision node for the decision layer.
 from typing import Callable
 import structlog
 
-from src.models import AgentState, ControlLoopPhase, Scenario, DecisionResult
-from src.decision.evaluator import DecisionEvaluator
+from src.models import AgentState, ControlLoopPhase, DecisionResult
+from src.decision.evaluator import DecisionEvaluator, ScenarioBatch
 
 logger = structlog.get_logger(__name__)
 
@@ -25,27 +25,33 @@ def create_decision_node(
         logger.info("Starting decision phase", cycle_id=state.get("cycle_id"))
 
         try:
-            # Get scenarios from planning
-            scenarios = [Scenario(**s) for s in state.get("scenarios", [])]
+            # Get scenarios from planning; they were validated when generated,
+            # so their columns are read straight from the dumped dicts
+            scenarios = ScenarioBatch.from_dicts(state.get("scenarios", []))
             planning_result = state.get("planning_result", {})
             comparison_matrix = planning_result.get("comparison_matrix", {})
 
             # Evaluate scenarios
             result = _evaluator.evaluate_scenarios(scenarios, comparison_matrix)
 
-            # Update state
+            # Dump once; the selected decision is already serialized inside it
+            dumped = result.model_dump()
+            selected = dumped["selected_decision"]
+            requires_human = result.requires_human_approval
+
+            # StateGraph merges the returned keys into the state, so only
+            # the changed ones are returned rather than a copy of the state
             updated_state: AgentState = {
-                **state,
                 "current_phase": ControlLoopPhase.DECIDE,
-                "decision_result": result.model_dump(),
-                "selected_decision": result.selected_decision.model_dump() if result.selected_decision else None,
-                "requires_human_intervention": result.requires_human_approval,
+                "decision_result": dumped,
+                "selected_decision": selected,
+                "requires_human_intervention": requires_human,
             }
 
             logger.info(
                 "Decision phase completed",
-                selected=result.selected_decision.scenario_id if result.selected_decision else None,
-                requires_human=result.requires_human_approval,
+                selected=selected["scenario_id"] if selected else None,
+                requires_human=requires_human,
             )
 
             return updated_state
@@ -53,7 +59,6 @@ def create_decision_node(
         except Exception as e:
             logger.error("Decision phase failed", error=str(e))
             return {
-                **state,
                 "current_phase": ControlLoopPhase.DECIDE,
                 "decision_result": DecisionResult(decision_trace=[f"Error: {e}"]).model_dump(),
                 "selected_decision": None,
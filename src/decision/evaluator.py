@@ -1,16 +1,117 @@
 """
 Decision evaluator for multi-criteria scenario evaluation.
 """
-import uuid
+import heapq
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Union
+import numpy as np
 import structlog
 
-from src.models import Scenario, Decision, ActionType, DecisionResult
+from src.models import Scenario, Decision, ActionType, DecisionResult, NUMBA_AVAILABLE, njit, prange
 from config.settings import settings
 
 logger = structlog.get_logger(__name__)
 
+# Action types by their raw string, so unknown types fall back without an exception
+_ACTION_TYPE_MAP = {a.value: a for a in ActionType}
+
+# Actions that need extra confidence before running unattended
+_HIGH_IMPACT = frozenset({ActionType.REASSIGN, ActionType.ESCALATE})
+
+# Normalization scales for cost, time and fuel: score = 1 / (1 + value / scale)
+SCORE_SCALES = np.array([100.0, 60.0, 10.0])
+
+# Per-scenario trace lines kept in a decision trace; the rest are summarized
+SCENARIO_TRACE_LIMIT = 50
+
+# From this many scenarios on, scoring runs in the parallel numba kernel;
+# smaller batches don't amortize the thread start-up
+PARALLEL_SCORE_MIN_BATCH = 1000
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _score_kernel(
+    costs: np.ndarray, times: np.ndarray, fuels: np.ndarray, rels: np.ndarray, w: np.ndarray,
+    scales: np.ndarray
+) -> np.ndarray:
+    """Weighted scores for every scenario as in _score_columns, split across threads."""
+    n = costs.shape[0]
+    out = np.empty(n)
+    for i in prange(n):
+        cs = 1.0 / (1.0 + costs[i] / scales[0])
+        ts = 1.0 / (1.0 + times[i] / scales[1])
+        fs = 1.0 / (1.0 + fuels[i] / scales[2])
+        out[i] = w[0] * cs + w[1] * ts + w[2] * rels[i] + w[3] * fs
+    return out
+
+
+def _score_columns(
+    costs: np.ndarray, times: np.ndarray, fuels: np.ndarray, rels: np.ndarray, w: np.ndarray
+) -> np.ndarray:
+    """
+    Weighted scores as one numpy expression, weights ordered cost, time, reliability, fuel.
+
+    This is the one definition of a scenario's score: cost, time and fuel are
+    normalized with SCORE_SCALES, reliability is used as is. _score_kernel
+    computes the same for large batches.
+    """
+    cost_scale, time_scale, fuel_scale = SCORE_SCALES
+    return (
+        w[0] / (1.0 + costs / cost_scale) +
+        w[1] / (1.0 + times / time_scale) +
+        w[2] * rels +
+        w[3] / (1.0 + fuels / fuel_scale)
+    )
+
+
+@dataclass
+class ScenarioBatch:
+    """
+    Scenarios as parallel columns (structure of arrays).
+
+    Scoring reads the numeric columns as contiguous arrays; the per-scenario
+    fields are only touched for the decisions that are kept.
+    """
+    ids: List[str]
+    names: List[str]
+    actions: List[List[Dict[str, Any]]]
+    costs: np.ndarray
+    times: np.ndarray
+    fuels: np.ndarray
+    reliabilities: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_scenarios(cls, scenarios: List[Scenario]) -> "ScenarioBatch":
+        """Build a batch from Scenario models."""
+        return cls._from_records(scenarios, getattr)
+
+    @classmethod
+    def from_dicts(cls, scenarios: List[Dict[str, Any]]) -> "ScenarioBatch":
+        """Build a batch from dumped scenarios, as stored in the agent state."""
+        return cls._from_records(scenarios, dict.__getitem__)
+
+    @classmethod
+    def _from_records(cls, records: list, get: Callable[[Any, str], Any]) -> "ScenarioBatch":
+        n = len(records)
+
+        def column(field: str) -> np.ndarray:
+            return np.fromiter((get(r, field) for r in records), dtype=np.float64, count=n)
+
+        return cls(
+            ids=[get(r, "id") for r in records],
+            names=[get(r, "name") for r in records],
+            actions=[get(r, "actions") for r in records],
+            costs=column("estimated_cost"),
+            times=column("estimated_time_minutes"),
+            fuels=column("estimated_fuel_liters"),
+            reliabilities=column("reliability_score"),
+        )
+
 
 class DecisionEvaluator:
     """
@@ -27,8 +128,12 @@ class DecisionEvaluator:
         self,
         confidence_threshold: float = None,
         weights: Dict[str, float] = None,
+        max_alternatives: Optional[int] = None,
+        verbose_trace: bool = True,
     ):
         self.confidence_threshold = confidence_threshold or settings.DECISION_CONFIDENCE_THRESHOLD
+        self.max_alternatives = max_alternatives
+        self.verbose_trace = verbose_trace
         self.weights = weights or {
             "cost": 0.25,
             "time": 0.35,
@@ -36,22 +141,36 @@ class DecisionEvaluator:
             "fuel": 0.10,
         }
 
+    @property
+    def weights(self) -> Dict[str, float]:
+        """Criterion weights keyed by cost, time, reliability and fuel."""
+        return self._weights
+
+    @weights.setter
+    def weights(self, weights: Dict[str, float]):
+        # The scoring kernels take the weights as one array, rebuilt only
+        # when the weights are replaced
+        self._weights = weights
+        self._weights_arr = np.array([
+            weights["cost"], weights["time"], weights["reliability"], weights["fuel"]
+        ], dtype=np.float64)
+
     def evaluate_scenarios(
         self,
-        scenarios: List[Scenario],
+        scenarios: Union[List[Scenario], ScenarioBatch],
         comparison_matrix: Dict[str, Dict[str, float]] = None,
     ) -> DecisionResult:
         """
         Evaluate scenarios and select the best one.
 
         Args:
-            scenarios: List of scenarios to evaluate
+            scenarios: Scenarios to evaluate, as models or a ScenarioBatch
             comparison_matrix: Pre-computed comparison scores
 
         Returns:
             DecisionResult with selected decision and alternatives
         """
-        if not scenarios:
+        if not len(scenarios):
             return DecisionResult(
                 selected_decision=None,
                 alternatives=[],
@@ -59,42 +178,91 @@ class DecisionEvaluator:
                 decision_trace=["No scenarios to evaluate"],
             )
 
-        decisions = []
-        traces = []
+        batch = scenarios if isinstance(scenarios, ScenarioBatch) else ScenarioBatch.from_scenarios(scenarios)
+        weights = self._weights_arr
 
-        for scenario in scenarios:
-            # Get or compute scores
-            if comparison_matrix and scenario.id in comparison_matrix:
-                scores = comparison_matrix[scenario.id]
-            else:
-                scores = self._compute_scores(scenario)
-
-            # Calculate weighted score
-            weighted_score = (
-                self.weights["cost"] * scores.get("cost_score", 0.5) +
-                self.weights["time"] * scores.get("time_score", 0.5) +
-                self.weights["reliability"] * scores.get("reliability", scenario.reliability_score) +
-                self.weights["fuel"] * scores.get("fuel_score", 0.5)
-            )
+        # When no alternatives are kept, a scenario that is best on every
+        # criterion wins under any non-negative weights, so it is the only
+        # one scored
+        if self.max_alternatives == 0 and not comparison_matrix:
+            dominant = self._dominant_index(batch)
+            if dominant is not None:
+                rows = slice(dominant, dominant + 1)
+                weighted_score = _score_columns(
+                    batch.costs[rows], batch.times[rows], batch.fuels[rows], batch.reliabilities[rows], weights
+                ).item()
+                return self._build_result(
+                    batch,
+                    [dominant],
+                    {dominant: weighted_score},
+                    [f"{batch.names[dominant]} dominates all {len(batch)} scenarios"],
+                )
 
-            # Determine action type
-            action_type = self._determine_action_type(scenario)
+        weighted_scores = self._score_batch(batch, weights)
+        reliabilities = batch.reliabilities.tolist()
 
-            # Create decision
-            decision = Decision(
-                id=f"DEC-{scenario.id}",
-                scenario_id=scenario.id,
-                action_type=action_type,
-                parameters={"actions": scenario.actions},
-                score=round(weighted_score, 3),
-                confidence=round(weighted_score * scenario.reliability_score, 3),
-                rationale=f"Selected {scenario.name}: score={weighted_score:.3f}, reliability={scenario.reliability_score}",
+        # Pre-computed comparison scores take precedence. They are gathered
+        # into one dense array and weighted in a single product
+        if comparison_matrix:
+            indices = []
+            rows = []
+            for i, scenario_id in enumerate(batch.ids):
+                scores = comparison_matrix.get(scenario_id)
+                if scores is not None:
+                    indices.append(i)
+                    rows.append((
+                        scores.get("cost_score", 0.5),
+                        scores.get("time_score", 0.5),
+                        scores.get("reliability", reliabilities[i]),
+                        scores.get("fuel_score", 0.5),
+                    ))
+            if rows:
+                weighted_scores[indices] = np.array(rows, dtype=np.float64) @ weights
+
+        score_list = weighted_scores.tolist()
+        traces = []
+        if self.verbose_trace:
+            traces.extend(
+                f"Evaluated {name}: score={weighted_score:.3f}"
+                for name, weighted_score in islice(zip(batch.names, score_list), SCENARIO_TRACE_LIMIT)
             )
-            decisions.append(decision)
-            traces.append(f"Evaluated {scenario.name}: score={weighted_score:.3f}")
+            if len(batch) > SCENARIO_TRACE_LIMIT:
+                traces.append(f"Evaluated {len(batch) - SCENARIO_TRACE_LIMIT} more scenarios")
+
+        # Only the kept decisions are built, best first. Every alternative is
+        # kept unless a caller capped them; when most scenarios would then be
+        # discarded, select the top ones without sorting the rest
+        keep = None if self.max_alternatives is None else self.max_alternatives + 1
+        if keep is None or keep >= len(batch):
+            ranked = np.argsort(-weighted_scores, kind="stable").tolist()
+        else:
+            ranked = heapq.nlargest(keep, range(len(batch)), key=score_list.__getitem__)
 
-        # Sort by score
-        decisions.sort(key=lambda d: d.score, reverse=True)
+        return self._build_result(batch, ranked, score_list, traces)
+
+    def _build_result(
+        self,
+        batch: ScenarioBatch,
+        ranked: List[int],
+        scores: Union[List[float], Dict[int, float]],
+        traces: List[str],
+    ) -> DecisionResult:
+        """Build decisions for the ranked scenario indices, best first."""
+        reliabilities = batch.reliabilities
+        decisions = []
+        for i in ranked:
+            weighted_score = scores[i]
+            reliability = reliabilities[i].item()
+            # Every field is derived from validated scenarios
+            decisions.append(Decision.model_construct(
+                id=f"DEC-{batch.ids[i]}",
+                scenario_id=batch.ids[i],
+                action_type=self._determine_action_type(batch.actions[i]),
+                parameters={"actions": batch.actions[i]},
+                score=round(weighted_score, 3),
+                confidence=round(weighted_score * reliability, 3),
+                rationale=f"Selected {batch.names[i]}: score={weighted_score:.3f}, reliability={reliability}",
+            ))
 
         # Select best decision
         best = decisions[0] if decisions else None
@@ -108,7 +276,7 @@ class DecisionEvaluator:
                 traces.append(f"Confidence {best.confidence:.2f} below threshold {self.confidence_threshold}")
 
             # Check for high-impact actions
-            if best.action_type in [ActionType.REASSIGN, ActionType.ESCALATE]:
+            if best.action_type in _HIGH_IMPACT:
                 if best.confidence < 0.85:
                     requires_human = True
                     traces.append(f"High-impact action requires verification")
@@ -123,30 +291,30 @@ class DecisionEvaluator:
             decision_trace=traces,
         )
 
-    def _compute_scores(self, scenario: Scenario) -> Dict[str, float]:
-        """Compute normalized scores for a scenario."""
-        # Simple normalization (in production, use actual ranges)
-        cost_score = 1 / (1 + scenario.estimated_cost / 100)
-        time_score = 1 / (1 + scenario.estimated_time_minutes / 60)
-        fuel_score = 1 / (1 + scenario.estimated_fuel_liters / 10)
-
-        return {
-            "cost_score": cost_score,
-            "time_score": time_score,
-            "fuel_score": fuel_score,
-            "reliability": scenario.reliability_score,
-            "overall": (cost_score + time_score + fuel_score + scenario.reliability_score) / 4,
-        }
-
-    def _determine_action_type(self, scenario: Scenario) -> ActionType:
-        """Determine primary action type from scenario."""
-        if not scenario.actions:
-            return ActionType.WAIT
+    def _score_batch(self, batch: ScenarioBatch, weights: np.ndarray) -> np.ndarray:
+        """Compute the weighted score of every scenario in one vectorized pass."""
+        if NUMBA_AVAILABLE and len(batch) >= PARALLEL_SCORE_MIN_BATCH:
+            return _score_kernel(
+                batch.costs, batch.times, batch.fuels, batch.reliabilities, weights, SCORE_SCALES
+            )
+        return _score_columns(batch.costs, batch.times, batch.fuels, batch.reliabilities, weights)
 
-        first_action = scenario.actions[0]
-        action_type_str = first_action.get("type", "wait")
+    def _dominant_index(self, batch: ScenarioBatch) -> Optional[int]:
+        """Index of a scenario at least as good as every other on all criteria, if any."""
+        if len(batch) < 2 or (self._weights_arr < 0).any():
+            return None
+        i = int(batch.costs.argmin())
+        if (
+            batch.times[i] == batch.times.min()
+            and batch.fuels[i] == batch.fuels.min()
+            and batch.reliabilities[i] == batch.reliabilities.max()
+        ):
+            return i
+        return None
 
-        try:
-            return ActionType(action_type_str)
-        except ValueError:
+    def _determine_action_type(self, actions: List[Dict[str, Any]]) -> ActionType:
+        """Determine primary action type from a scenario's actions."""
+        if not actions:
             return ActionType.WAIT
+
+        return _ACTION_TYPE_MAP.get(actions[0].get("type", "wait"), ActionType.WAIT)
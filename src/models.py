@@ -6,10 +6,90 @@ used throughout the control loop.
 """
 from datetime import datetime
 from enum import Enum
+from math import radians as _radians, sin as _sin, cos as _cos, sqrt as _sqrt, atan2 as _atan2
 from typing import Any, Optional
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, Field, TypeAdapter
 from typing_extensions import TypedDict
 
+# numba is optional. Modules with kernels import njit, prange and
+# NUMBA_AVAILABLE from here rather than repeating this fallback
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+# ============================================================================
+# Geometry kernels
+# ============================================================================
+
+EARTH_RADIUS_KM = 6371.0
+
+
+@njit(cache=True, fastmath=True)
+def haversine_rad_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance in km between two coordinates given in radians."""
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = _sin(dlat / 2) ** 2 + _cos(lat1) * _cos(lat2) * _sin(dlon / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * _atan2(_sqrt(a), _sqrt(1 - a))
+
+
+@njit(cache=True, fastmath=True)
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine distance in km between two coordinates."""
+    # The math functions are bound at module scope so the plain Python path
+    # (without numba) avoids an attribute lookup per call
+    return haversine_rad_km(_radians(lat1), _radians(lon1), _radians(lat2), _radians(lon2))
+
+
+@njit(cache=True, parallel=True)
+def haversine_matrix(origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    """
+    Haversine distances in km from every origin to every destination.
+
+    Both arguments are (n, 2) arrays of radians, as built by build_location_matrix.
+    """
+    n, m = origins.shape[0], destinations.shape[0]
+    out = np.empty((n, m))
+    for i in prange(n):
+        for j in range(m):
+            out[i, j] = haversine_rad_km(
+                origins[i, 0], origins[i, 1], destinations[j, 0], destinations[j, 1]
+            )
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def haversine_pairs(origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    """
+    Haversine distances in km between matching rows of two (n, 2) radian arrays.
+    """
+    n = origins.shape[0]
+    out = np.empty(n)
+    for i in range(n):
+        out[i] = haversine_rad_km(origins[i, 0], origins[i, 1], destinations[i, 0], destinations[i, 1])
+    return out
+
+
+def build_location_matrix(locations: list) -> np.ndarray:
+    """Stack the coordinates of locations into an (n, 2) radian array for haversine_matrix."""
+    out = np.empty((len(locations), 2))
+    for i, loc in enumerate(locations):
+        out[i, 0] = loc.latitude
+        out[i, 1] = loc.longitude
+    return np.radians(out, out=out)
+
 
 # ============================================================================
 # Enums
@@ -81,6 +161,8 @@ class ControlLoopPhase(str, Enum):
 
 class Location(BaseModel):
     """Geographic location with coordinates."""
+    __slots__ = ()
+
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
     address: Optional[str] = None
@@ -88,24 +170,13 @@ class Location(BaseModel):
 
     def distance_to(self, other: "Location") -> float:
         """Calculate approximate distance in km using Haversine formula."""
-        from math import radians, sin, cos, sqrt, atan2
-
-        R = 6371  # Earth's radius in km
-
-        lat1, lon1 = radians(self.latitude), radians(self.longitude)
-        lat2, lon2 = radians(other.latitude), radians(other.longitude)
-
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-
-        return R * c
+        return haversine_km(self.latitude, self.longitude, other.latitude, other.longitude)
 
 
 class GPSReading(BaseModel):
     """GPS reading from a truck."""
+    __slots__ = ()
+
     truck_id: str
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     location: Location
@@ -116,6 +187,8 @@ class GPSReading(BaseModel):
 
 class Truck(BaseModel):
     """Truck entity in the fleet."""
+    __slots__ = ()
+
     id: str
     name: str
     status: TruckStatus = TruckStatus.IDLE
@@ -162,6 +235,8 @@ class Route(BaseModel):
 
 class Load(BaseModel):
     """Load/cargo to be transported."""
+    __slots__ = ()
+
     id: str
     description: str
     weight_kg: float = Field(gt=0)
@@ -188,6 +263,8 @@ class Load(BaseModel):
 
 class DeliveryRequest(BaseModel):
     """A delivery request submitted by a user."""
+    __slots__ = ()
+
     id: str
     customer_name: str
     customer_phone: Optional[str] = None
@@ -231,8 +308,20 @@ class DeliveryRequest(BaseModel):
     allocation_reasoning: Optional[str] = None
 
 
+# Travel time multiplier per traffic level
+_DELAY_FACTORS = {
+    TrafficLevel.FREE_FLOW: 1.0,
+    TrafficLevel.LIGHT: 1.1,
+    TrafficLevel.MODERATE: 1.3,
+    TrafficLevel.HEAVY: 1.7,
+    TrafficLevel.STANDSTILL: 3.0,
+}
+
+
 class TrafficCondition(BaseModel):
     """Traffic condition on a road segment."""
+    __slots__ = ()
+
     segment_id: str
     level: TrafficLevel
     speed_kmh: float = Field(ge=0)
@@ -244,14 +333,7 @@ class TrafficCondition(BaseModel):
     @property
     def delay_factor(self) -> float:
         """Calculate delay factor (1.0 = no delay, 2.0 = double time)."""
-        factors = {
-            TrafficLevel.FREE_FLOW: 1.0,
-            TrafficLevel.LIGHT: 1.1,
-            TrafficLevel.MODERATE: 1.3,
-            TrafficLevel.HEAVY: 1.7,
-            TrafficLevel.STANDSTILL: 3.0,
-        }
-        return factors.get(self.level, 1.5)
+        return _DELAY_FACTORS.get(self.level, 1.5)
 
 
 # ============================================================================
@@ -459,6 +541,16 @@ class AgentState(TypedDict, total=False):
 # System State (High-level wrapper)
 # ============================================================================
 
+# Compiled list serializers: one pydantic-core pass per collection instead of
+# a model_dump() call per item
+TRUCK_LIST_ADAPTER = TypeAdapter(list[Truck])
+ROUTE_LIST_ADAPTER = TypeAdapter(list[Route])
+LOAD_LIST_ADAPTER = TypeAdapter(list[Load])
+TRAFFIC_LIST_ADAPTER = TypeAdapter(list[TrafficCondition])
+GPS_READING_LIST_ADAPTER = TypeAdapter(list[GPSReading])
+ISSUE_LIST_ADAPTER = TypeAdapter(list[Issue])
+
+
 class SystemState(BaseModel):
     """
     High-level system state combining all components.
@@ -485,11 +577,11 @@ class SystemState(BaseModel):
     def to_agent_state(self) -> AgentState:
         """Convert to LangGraph AgentState."""
         return AgentState(
-            trucks=[t.model_dump() for t in self.trucks],
-            routes=[r.model_dump() for r in self.routes],
-            loads=[l.model_dump() for l in self.loads],
-            traffic_conditions=[tc.model_dump() for tc in self.traffic_conditions],
-            current_issues=[i.model_dump() for i in self.active_issues],
+            trucks=TRUCK_LIST_ADAPTER.dump_python(self.trucks),
+            routes=ROUTE_LIST_ADAPTER.dump_python(self.routes),
+            loads=LOAD_LIST_ADAPTER.dump_python(self.loads),
+            traffic_conditions=TRAFFIC_LIST_ADAPTER.dump_python(self.traffic_conditions),
+            current_issues=ISSUE_LIST_ADAPTER.dump_python(self.active_issues),
             total_cycles=self.total_cycles_completed,
             continue_loop=True,
             requires_human_intervention=False,
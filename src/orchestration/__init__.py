@@ -1,4 +1,4 @@
 """Orchestration layer for LangGraph control loop."""
-from .graph import create_control_loop_graph, run_control_loop
+from .graph import create_control_loop_graph, run_control_loop, clear_graph_cache
 
-__all__ = ["create_control_loop_graph", "run_control_loop"]
+__all__ = ["create_control_loop_graph", "run_control_loop", "clear_graph_cache"]
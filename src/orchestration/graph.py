@@ -4,14 +4,17 @@ LangGraph StateGraph implementation for the control loop.
 Implements the complete control loop:
 OBSERVE -> REASON -> PLAN -> DECIDE -> ACT -> FEEDBACK -> (loop)
 """
+import functools
+import itertools
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Literal
+from typing import Any, Callable, Dict, Literal
 import structlog
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, END
 
-from src.models import AgentState, ControlLoopPhase, Truck
+from src.models import AgentState, ControlLoopPhase, Truck, TRUCK_LIST_ADAPTER
 from src.perception.observation_node import create_observation_node
 from src.reasoning.reasoning_node import create_reasoning_node
 from src.planning.planning_node import create_planning_node
@@ -19,6 +22,11 @@ from src.decision.decision_node import create_decision_node
 
 logger = structlog.get_logger(__name__)
 
+# Action IDs are a random per-process prefix plus a counter, so they stay
+# distinct across workers and restarts without drawing random bytes per action
+_ACTION_ID_PREFIX = uuid.uuid4().hex[:8]
+_ACTION_IDS = itertools.count()
+
 
 def create_action_node():
     """Create action execution node."""
@@ -32,7 +40,7 @@ def create_action_node():
         if decision:
             # Simulate action execution
             action_results.append({
-                "action_id": f"ACT-{uuid.uuid4().hex[:8]}",
+                "action_id": f"ACT-{_ACTION_ID_PREFIX}-{next(_ACTION_IDS):06x}",
                 "decision_id": decision.get("id"),
                 "success": True,
                 "message": f"Executed {decision.get('action_type')}",
@@ -40,7 +48,6 @@ def create_action_node():
             })
 
         return {
-            **state,
             "current_phase": ControlLoopPhase.ACT,
             "action_results": action_results,
         }
@@ -70,7 +77,6 @@ def create_feedback_node():
                 })
 
         return {
-            **state,
             "current_phase": ControlLoopPhase.FEEDBACK,
             "feedback_result": feedback_result,
             "cycle_end_time": datetime.utcnow().isoformat(),
@@ -98,31 +104,38 @@ def should_continue(state: AgentState) -> Literal["continue", "stop", "human"]:
     return "continue"
 
 
-def create_control_loop_graph() -> StateGraph:
-    """
-    Create the complete LangGraph control loop.
+# Node names in control loop order, with the factories that build them
+_NODE_FACTORIES = {
+    "observe": create_observation_node,
+    "reason": create_reasoning_node,
+    "plan": create_planning_node,
+    "decide": create_decision_node,
+    "act": create_action_node,
+    "feedback": create_feedback_node,
+}
 
-    Returns:
-        Compiled StateGraph
-    """
-    # Create nodes
-    observe_node = create_observation_node()
-    reason_node = create_reasoning_node()
-    plan_node = create_planning_node()
-    decide_node = create_decision_node()
-    action_node = create_action_node()
-    feedback_node = create_feedback_node()
-
-    # Build graph
+
+def _create_nodes() -> Dict[str, Callable[[AgentState], AgentState]]:
+    """Build a fresh set of control loop nodes, with their own collector state."""
+    return {name: factory() for name, factory in _NODE_FACTORIES.items()}
+
+
+def _dispatch(name: str) -> Callable[[AgentState, RunnableConfig], AgentState]:
+    """A graph node that runs the named node of the current run."""
+    def node(state: AgentState, config: RunnableConfig) -> AgentState:
+        return config["configurable"]["nodes"][name](state)
+
+    node.__name__ = name
+    return node
+
+
+def _build_graph(nodes: Dict[str, Callable]) -> StateGraph:
+    """Wire the given nodes into the control loop and compile it."""
     graph = StateGraph(AgentState)
 
     # Add nodes
-    graph.add_node("observe", observe_node)
-    graph.add_node("reason", reason_node)
-    graph.add_node("plan", plan_node)
-    graph.add_node("decide", decide_node)
-    graph.add_node("act", action_node)
-    graph.add_node("feedback", feedback_node)
+    for name, node in nodes.items():
+        graph.add_node(name, node)
 
     # Add edges (linear flow)
     graph.add_edge("observe", "reason")
@@ -150,6 +163,33 @@ def create_control_loop_graph() -> StateGraph:
     return graph.compile()
 
 
+def create_control_loop_graph() -> StateGraph:
+    """
+    Create the complete LangGraph control loop.
+
+    Returns:
+        Compiled StateGraph
+    """
+    return _build_graph(_create_nodes())
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_graph():
+    """
+    Compiled control loop topology, built on first use and reused across runs.
+
+    Its nodes hold no state: each dispatches to the nodes that
+    run_control_loop builds for the run and passes in the run config, so
+    collector and preprocessor history never carries over between runs.
+    """
+    return _build_graph({name: _dispatch(name) for name in _NODE_FACTORIES})
+
+
+def clear_graph_cache() -> None:
+    """Drop the cached graph so the next run builds a fresh one."""
+    _cached_graph.cache_clear()
+
+
 def run_control_loop(
     initial_trucks: list[Truck] = None,
     max_cycles: int = 1,
@@ -168,7 +208,7 @@ def run_control_loop(
     state: AgentState = {
         "current_phase": ControlLoopPhase.OBSERVE,
         "cycle_id": str(uuid.uuid4()),
-        "trucks": [t.model_dump() for t in (initial_trucks or [])],
+        "trucks": TRUCK_LIST_ADAPTER.dump_python(initial_trucks or []),
         "routes": [],
         "loads": [],
         "traffic_conditions": [],
@@ -191,13 +231,17 @@ def run_control_loop(
         "total_cycles": 0,
     }
 
-    # Create and run graph
-    graph = create_control_loop_graph()
+    # The topology is cached; the nodes, and the state they keep, are per run
+    graph = _cached_graph()
+    nodes = _create_nodes()
 
     logger.info("Starting control loop", max_cycles=max_cycles)
 
-    # Run the graph
-    result = graph.invoke(state)
+    # Run the graph, then close the event loop of this run's observation node
+    try:
+        result = graph.invoke(state, config={"configurable": {"nodes": nodes}})
+    finally:
+        nodes["observe"].close()
 
     logger.info(
         "Control loop completed",
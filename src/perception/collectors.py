@@ -7,27 +7,128 @@ These collectors gather data from various sources:
 - Load manifests from systems
 """
 import asyncio
-import random
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
+from itertools import accumulate
 from typing import Any, Optional
+import numpy as np
 import structlog
 
 from src.models import (
     GPSReading, Location, Truck, TruckStatus,
-    TrafficCondition, TrafficLevel, Load, LoadPriority
+    TrafficCondition, TrafficLevel, Load, LoadPriority,
+    NUMBA_AVAILABLE, njit, prange,
 )
 
 logger = structlog.get_logger(__name__)
 
+# Simulated traffic: level odds as cumulative weights, and the speed each
+# level allows as a fraction of the free-flow speed
+_TRAFFIC_LEVELS = (
+    TrafficLevel.FREE_FLOW, TrafficLevel.LIGHT, TrafficLevel.MODERATE,
+    TrafficLevel.HEAVY, TrafficLevel.STANDSTILL,
+)
+_TRAFFIC_CUM_WEIGHTS = tuple(accumulate((0.3, 0.3, 0.25, 0.12, 0.03)))
+_SPEED_FACTORS = {
+    TrafficLevel.FREE_FLOW: 1.0,
+    TrafficLevel.LIGHT: 0.85,
+    TrafficLevel.MODERATE: 0.65,
+    TrafficLevel.HEAVY: 0.4,
+    TrafficLevel.STANDSTILL: 0.1,
+}
+_DELAYED_LEVELS = frozenset({TrafficLevel.HEAVY, TrafficLevel.STANDSTILL})
+_INCIDENTS = (
+    "Vehicle breakdown on shoulder",
+    "Multi-vehicle accident, lane blocked",
+    "Road construction",
+    "Emergency vehicle activity",
+    "Weather-related slowdown",
+)
+_DEFAULT_SEGMENTS = (
+    "SEG-I95-NB-1", "SEG-I95-NB-2", "SEG-I95-SB-1",
+    "SEG-9A-NB-1", "SEG-9A-SB-1",
+    "SEG-LOCAL-1", "SEG-LOCAL-2",
+)
+
+# Simulated loads: priority odds as cumulative weights, and hours to deadline
+_PRIORITIES = (
+    LoadPriority.LOW, LoadPriority.NORMAL, LoadPriority.HIGH,
+    LoadPriority.URGENT, LoadPriority.CRITICAL,
+)
+_PRIORITY_CUM_WEIGHTS = tuple(accumulate((0.1, 0.5, 0.25, 0.1, 0.05)))
+_DEADLINE_HOURS = {
+    LoadPriority.CRITICAL: 2,
+    LoadPriority.URGENT: 4,
+    LoadPriority.HIGH: 8,
+    LoadPriority.NORMAL: 24,
+    LoadPriority.LOW: 48,
+}
+_LOAD_DESCRIPTIONS = (
+    "General merchandise",
+    "Electronics - fragile",
+    "Food products - temperature controlled",
+    "Industrial equipment",
+    "Medical supplies",
+    "Retail inventory",
+)
+_WAREHOUSES = ("A", "B", "C", "D")
+_URGENT_PRIORITIES = frozenset({LoadPriority.URGENT, LoadPriority.CRITICAL})
+
+# From this many trucks on, positions are updated in the parallel numba
+# kernel; smaller fleets don't amortize the thread start-up
+PARALLEL_GPS_MIN_FLEET = 1000
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _update_positions(
+    last_lat: np.ndarray, last_lng: np.ndarray, moving: np.ndarray, rand: np.ndarray
+):
+    """
+    Move every truck in one pass.
+
+    rand holds five uniform [0, 1) draws per truck: speed, heading, latitude
+    drift, longitude drift and accuracy. Returns new latitudes, longitudes,
+    speeds, headings and accuracies.
+    """
+    n = last_lat.shape[0]
+    lat = np.empty(n)
+    lng = np.empty(n)
+    speed = np.zeros(n)
+    heading = np.zeros(n)
+    accuracy = np.empty(n)
+    for i in prange(n):
+        accuracy[i] = 3.0 + 12.0 * rand[i, 4]
+        if moving[i]:
+            speed[i] = 30.0 + 50.0 * rand[i, 0]
+            heading[i] = 360.0 * rand[i, 1]
+            movement = (speed[i] / 3600.0) * 30.0 / 111.0
+            lat[i] = min(90.0, max(-90.0, last_lat[i] + movement * (2.0 * rand[i, 2] - 1.0)))
+            lng[i] = min(180.0, max(-180.0, last_lng[i] + movement * (2.0 * rand[i, 3] - 1.0)))
+        else:
+            lat[i] = last_lat[i]
+            lng[i] = last_lng[i]
+    return lat, lng, speed, heading, accuracy
+
+
+def _weighted_indices(rng: np.random.Generator, cum_weights: tuple, n: int) -> list[int]:
+    """Draw n indices with the odds given by cumulative weights."""
+    return np.searchsorted(cum_weights, rng.random(n) * cum_weights[-1], side="right").tolist()
+
 
 class BaseCollector(ABC):
     """Base class for all data collectors."""
 
+    # Collectors are long-lived and touch their stats every cycle, so every
+    # collector class declares its attributes as slots
+    __slots__ = ("name", "last_collection", "collection_count", "_rng")
+
     def __init__(self, name: str):
         self.name = name
         self.last_collection: Optional[datetime] = None
         self.collection_count = 0
+        # Simulators draw all of a collection's random values in batches
+        self._rng = np.random.default_rng()
 
     @abstractmethod
     async def collect(self) -> list[Any]:
@@ -50,19 +151,23 @@ class GPSCollector(BaseCollector):
     - Telematics providers
     """
 
+    __slots__ = ("trucks", "simulate", "_truck_index", "_last_lat", "_last_lng", "_collect_impl")
+
     def __init__(self, trucks: list[Truck] = None, simulate: bool = True):
         super().__init__("GPSCollector")
         self.trucks = trucks or []
         self.simulate = simulate
-        # Simulated movement parameters
-        self._last_positions: dict[str, Location] = {}
+        # The data source is fixed at construction
+        self._collect_impl = self._simulate_gps_readings if simulate else self._fetch_real_gps_data
+        # Last simulated positions as parallel arrays, indexed through
+        # _truck_index so a collection updates the whole fleet at once
+        self._truck_index: dict[str, int] = {}
+        self._last_lat = np.empty(0)
+        self._last_lng = np.empty(0)
 
     async def collect(self) -> list[GPSReading]:
         """Collect GPS readings for all trucks."""
-        if self.simulate:
-            readings = await self._simulate_gps_readings()
-        else:
-            readings = await self._fetch_real_gps_data()
+        readings = await self._collect_impl()
 
         self._update_stats()
         logger.info(
@@ -75,60 +180,77 @@ class GPSCollector(BaseCollector):
 
     async def _simulate_gps_readings(self) -> list[GPSReading]:
         """Generate simulated GPS readings for testing."""
-        readings = []
-
-        for truck in self.trucks:
-            # Get or initialize last position
-            if truck.id not in self._last_positions:
+        trucks = self.trucks
+        n = len(trucks)
+        # Readings from one collection share its timestamp
+        now = datetime.utcnow()
+
+        # Look every truck up once, registering trucks seen for the first time
+        index = self._truck_index
+        known = len(self._last_lat)
+        idx = np.empty(n, dtype=np.intp)
+        new_trucks = []
+        for i, truck in enumerate(trucks):
+            j = index.get(truck.id)
+            if j is None:
+                j = index[truck.id] = known + len(new_trucks)
+                new_trucks.append(truck)
+            idx[i] = j
+
+        if new_trucks:
+            start_lat = np.empty(len(new_trucks))
+            start_lng = np.empty(len(new_trucks))
+            for i, truck in enumerate(new_trucks):
                 if truck.current_location:
-                    self._last_positions[truck.id] = truck.current_location
+                    start_lat[i] = truck.current_location.latitude
+                    start_lng[i] = truck.current_location.longitude
                 else:
                     # Default to NYC area
-                    self._last_positions[truck.id] = Location(
-                        latitude=40.7128 + random.uniform(-0.1, 0.1),
-                        longitude=-74.0060 + random.uniform(-0.1, 0.1)
-                    )
-
-            last_pos = self._last_positions[truck.id]
-
-            # Simulate movement based on status
-            if truck.status == TruckStatus.EN_ROUTE:
-                # Moving truck - add some movement
-                speed = random.uniform(30, 80)  # km/h
-                heading = random.uniform(0, 360)
-
-                # Calculate new position (simplified)
-                # ~0.01 degree ≈ 1.1 km at mid-latitudes
-                movement = (speed / 3600) * 30 / 111  # 30 second movement in degrees
-                new_lat = last_pos.latitude + movement * random.uniform(-1, 1)
-                new_lng = last_pos.longitude + movement * random.uniform(-1, 1)
-
-                new_location = Location(
-                    latitude=max(-90, min(90, new_lat)),
-                    longitude=max(-180, min(180, new_lng))
-                )
-            else:
-                # Stationary truck
-                speed = 0
-                heading = 0
-                new_location = last_pos
-
-            self._last_positions[truck.id] = new_location
-
-            reading = GPSReading(
+                    start_lat[i] = 40.7128 + self._rng.uniform(-0.1, 0.1)
+                    start_lng[i] = -74.0060 + self._rng.uniform(-0.1, 0.1)
+            self._last_lat = np.concatenate((self._last_lat, start_lat))
+            self._last_lng = np.concatenate((self._last_lng, start_lng))
+
+        moving = np.fromiter((t.status == TruckStatus.EN_ROUTE for t in trucks), dtype=bool, count=n)
+        last_lat = self._last_lat[idx]
+        last_lng = self._last_lng[idx]
+
+        rng = self._rng
+        if NUMBA_AVAILABLE and n >= PARALLEL_GPS_MIN_FLEET:
+            new_lat, new_lng, speed, heading, accuracy = _update_positions(
+                last_lat, last_lng, moving, rng.random((n, 5))
+            )
+        else:
+            # Moving trucks get a random speed and heading; stationary ones
+            # keep their position and report zero speed
+            speed = np.where(moving, rng.uniform(30, 80, n), 0.0)  # km/h
+            heading = np.where(moving, rng.uniform(0, 360, n), 0.0)
+            accuracy = rng.uniform(3, 15, n)
+
+            # Calculate new position (simplified)
+            # ~0.01 degree ≈ 1.1 km at mid-latitudes
+            movement = (speed / 3600) * 30 / 111  # 30 second movement in degrees
+            new_lat = np.clip(last_lat + movement * rng.uniform(-1, 1, n), -90, 90)
+            new_lng = np.clip(last_lng + movement * rng.uniform(-1, 1, n), -180, 180)
+
+        self._last_lat[idx] = new_lat
+        self._last_lng[idx] = new_lng
+
+        # Clipped values are in range, so the models skip validation
+        return [
+            GPSReading.model_construct(
                 truck_id=truck.id,
-                timestamp=datetime.utcnow(),
-                location=new_location,
-                speed_kmh=speed,
-                heading=heading,
-                accuracy_meters=random.uniform(3, 15)
+                timestamp=now,
+                location=Location.model_construct(latitude=lat, longitude=lng),
+                speed_kmh=spd,
+                heading=hdg,
+                accuracy_meters=acc,
             )
-            readings.append(reading)
-
-            # Small delay to simulate async collection
-            await asyncio.sleep(0.01)
-
-        return readings
+            for truck, lat, lng, spd, hdg, acc in zip(
+                trucks, new_lat.tolist(), new_lng.tolist(),
+                speed.tolist(), heading.tolist(), accuracy.tolist()
+            )
+        ]
 
     async def _fetch_real_gps_data(self) -> list[GPSReading]:
         """Fetch real GPS data from fleet API."""
@@ -150,19 +272,20 @@ class TrafficCollector(BaseCollector):
     - Local DOT feeds
     """
 
+    __slots__ = ("route_segments", "simulate", "_incident_probability", "_collect_impl")
+
     def __init__(self, route_segments: list[str] = None, simulate: bool = True):
         super().__init__("TrafficCollector")
         self.route_segments = route_segments or []
         self.simulate = simulate
+        # The data source is fixed at construction
+        self._collect_impl = self._simulate_traffic_conditions if simulate else self._fetch_real_traffic_data
         # Simulate traffic patterns
         self._incident_probability = 0.1
 
     async def collect(self) -> list[TrafficCondition]:
         """Collect traffic conditions for monitored segments."""
-        if self.simulate:
-            conditions = await self._simulate_traffic_conditions()
-        else:
-            conditions = await self._fetch_real_traffic_data()
+        conditions = await self._collect_impl()
 
         self._update_stats()
         logger.info(
@@ -178,56 +301,39 @@ class TrafficCollector(BaseCollector):
         conditions = []
 
         # Default segments if none provided
-        segments = self.route_segments or [
-            "SEG-I95-NB-1", "SEG-I95-NB-2", "SEG-I95-SB-1",
-            "SEG-9A-NB-1", "SEG-9A-SB-1",
-            "SEG-LOCAL-1", "SEG-LOCAL-2"
-        ]
+        segments = self.route_segments or _DEFAULT_SEGMENTS
 
-        for segment_id in segments:
-            # Simulate traffic level
-            level_weights = {
-                TrafficLevel.FREE_FLOW: 0.3,
-                TrafficLevel.LIGHT: 0.3,
-                TrafficLevel.MODERATE: 0.25,
-                TrafficLevel.HEAVY: 0.12,
-                TrafficLevel.STANDSTILL: 0.03,
-            }
+        # Conditions from one collection share its timestamp
+        now = datetime.utcnow()
 
-            level = random.choices(
-                list(level_weights.keys()),
-                weights=list(level_weights.values())
-            )[0]
+        # Draw every segment's random values up front
+        n = len(segments)
+        rng = self._rng
+        level_idx = _weighted_indices(rng, _TRAFFIC_CUM_WEIGHTS, n)
+        delays = rng.uniform(5, 30, n).tolist()
+        incident_hits = (rng.random(n) < self._incident_probability).tolist()
+        incident_idx = rng.integers(0, len(_INCIDENTS), n).tolist()
+        incident_delays = rng.uniform(10, 45, n).tolist()
+
+        for i, segment_id in enumerate(segments):
+            # Simulate traffic level
+            level = _TRAFFIC_LEVELS[level_idx[i]]
 
             # Calculate speed based on level
             base_speed = 65  # km/h
-            speed_factors = {
-                TrafficLevel.FREE_FLOW: 1.0,
-                TrafficLevel.LIGHT: 0.85,
-                TrafficLevel.MODERATE: 0.65,
-                TrafficLevel.HEAVY: 0.4,
-                TrafficLevel.STANDSTILL: 0.1,
-            }
-            speed = base_speed * speed_factors[level]
+            speed = base_speed * _SPEED_FACTORS[level]
 
             # Calculate delay
             delay = 0
-            if level in [TrafficLevel.HEAVY, TrafficLevel.STANDSTILL]:
-                delay = random.uniform(5, 30)
+            if level in _DELAYED_LEVELS:
+                delay = delays[i]
 
             # Simulate incidents
             incident = None
-            if random.random() < self._incident_probability:
-                incidents = [
-                    "Vehicle breakdown on shoulder",
-                    "Multi-vehicle accident, lane blocked",
-                    "Road construction",
-                    "Emergency vehicle activity",
-                    "Weather-related slowdown",
-                ]
-                incident = random.choice(incidents)
+            if incident_hits[i]:
+                incident = _INCIDENTS[incident_idx[i]]
                 level = TrafficLevel.HEAVY
-                delay = random.uniform(10, 45)
+                delay = incident_delays[i]
 
             condition = TrafficCondition(
                 segment_id=segment_id,
@@ -235,7 +341,7 @@ class TrafficCollector(BaseCollector):
                 speed_kmh=speed,
                 delay_minutes=delay,
                 incident_description=incident,
-                timestamp=datetime.utcnow()
+                timestamp=now
             )
             conditions.append(condition)
 
@@ -260,24 +366,25 @@ class LoadCollector(BaseCollector):
     - Customer APIs
     """
 
+    __slots__ = ("simulate", "_load_counter", "_collect_impl")
+
     def __init__(self, simulate: bool = True):
         super().__init__("LoadCollector")
         self.simulate = simulate
+        # The data source is fixed at construction
+        self._collect_impl = self._simulate_loads if simulate else self._fetch_real_load_data
         self._load_counter = 0
 
     async def collect(self) -> list[Load]:
         """Collect current load manifests."""
-        if self.simulate:
-            loads = await self._simulate_loads()
-        else:
-            loads = await self._fetch_real_load_data()
+        loads = await self._collect_impl()
 
         self._update_stats()
         logger.info(
             "Load data collected",
             collector=self.name,
             loads=len(loads),
-            urgent=sum(1 for l in loads if l.priority in [LoadPriority.URGENT, LoadPriority.CRITICAL])
+            urgent=sum(l.priority in _URGENT_PRIORITIES for l in loads)
         )
         return loads
 
@@ -286,59 +393,60 @@ class LoadCollector(BaseCollector):
         loads = []
 
         # Generate 3-8 loads
-        num_loads = random.randint(3, 8)
-
-        for i in range(num_loads):
-            self._load_counter += 1
-            load_id = f"LOAD-{datetime.utcnow().strftime('%Y%m%d')}-{self._load_counter:04d}"
-
+        rng = self._rng
+        num_loads = int(rng.integers(3, 9))
+        now = datetime.utcnow()
+        date_str = now.strftime('%Y%m%d')
+        pickup_end = now + timedelta(hours=2)
+        deadlines = {p: now + timedelta(hours=h) for p, h in _DEADLINE_HOURS.items()}
+
+        # Draw every load's random values up front
+        pickup_lat = (40.7128 + rng.uniform(-0.15, 0.15, num_loads)).tolist()
+        pickup_lng = (-74.0060 + rng.uniform(-0.15, 0.15, num_loads)).tolist()
+        delivery_lat = (40.7128 + rng.uniform(-0.2, 0.2, num_loads)).tolist()
+        delivery_lng = (-74.0060 + rng.uniform(-0.2, 0.2, num_loads)).tolist()
+        warehouse_idx = rng.integers(0, len(_WAREHOUSES), num_loads).tolist()
+        customers = rng.integers(100, 1000, num_loads).tolist()
+        priority_idx = _weighted_indices(rng, _PRIORITY_CUM_WEIGHTS, num_loads)
+        description_idx = rng.integers(0, len(_LOAD_DESCRIPTIONS), num_loads).tolist()
+        weights = rng.uniform(500, 8000, num_loads).tolist()
+        volumes = rng.uniform(2, 25, num_loads).tolist()
+
+        # Reserve this collection's load numbers in one step
+        first = self._load_counter + 1
+        self._load_counter += num_loads
+        load_ids = [f"LOAD-{date_str}-{c:04d}" for c in range(first, first + num_loads)]
+
+        for i, load_id in enumerate(load_ids):
             # Random locations in NYC area
             pickup = Location(
-                latitude=40.7128 + random.uniform(-0.15, 0.15),
-                longitude=-74.0060 + random.uniform(-0.15, 0.15),
-                name=f"Warehouse {random.choice(['A', 'B', 'C', 'D'])}"
+                latitude=pickup_lat[i],
+                longitude=pickup_lng[i],
+                name=f"Warehouse {_WAREHOUSES[warehouse_idx[i]]}"
             )
 
             delivery = Location(
-                latitude=40.7128 + random.uniform(-0.2, 0.2),
-                longitude=-74.0060 + random.uniform(-0.2, 0.2),
-                name=f"Customer {random.randint(100, 999)}"
+                latitude=delivery_lat[i],
+                longitude=delivery_lng[i],
+                name=f"Customer {customers[i]}"
             )
 
             # Random priority with weights
-            priority = random.choices(
-                [LoadPriority.LOW, LoadPriority.NORMAL, LoadPriority.HIGH,
-                 LoadPriority.URGENT, LoadPriority.CRITICAL],
-                weights=[0.1, 0.5, 0.25, 0.1, 0.05]
-            )[0]
+            priority = _PRIORITIES[priority_idx[i]]
 
             # Deadline based on priority
-            hours_map = {
-                LoadPriority.CRITICAL: 2,
-                LoadPriority.URGENT: 4,
-                LoadPriority.HIGH: 8,
-                LoadPriority.NORMAL: 24,
-                LoadPriority.LOW: 48,
-            }
-            deadline = datetime.utcnow() + timedelta(hours=hours_map[priority])
+            deadline = deadlines[priority]
 
             load = Load(
                 id=load_id,
-                description=random.choice([
-                    "General merchandise",
-                    "Electronics - fragile",
-                    "Food products - temperature controlled",
-                    "Industrial equipment",
-                    "Medical supplies",
-                    "Retail inventory",
-                ]),
-                weight_kg=random.uniform(500, 8000),
-                volume_m3=random.uniform(2, 25),
+                description=_LOAD_DESCRIPTIONS[description_idx[i]],
+                weight_kg=weights[i],
+                volume_m3=volumes[i],
                 priority=priority,
                 pickup_location=pickup,
                 delivery_location=delivery,
-                pickup_window_start=datetime.utcnow(),
-                pickup_window_end=datetime.utcnow() + timedelta(hours=2),
+                pickup_window_start=now,
+                pickup_window_end=pickup_end,
                 delivery_deadline=deadline,
             )
             loads.append(load)
@@ -351,20 +459,60 @@ class LoadCollector(BaseCollector):
 
 
 class AggregatedCollector:
-    """Aggregates data from all collectors into a unified observation."""
+    """
+    Aggregates data from all collectors into a unified observation.
+
+    With caching_ttl_s set, a result is reused while the fleet (truck IDs and
+    statuses) is unchanged and the result is younger than caching_ttl_s. For a
+    further caching_swr_ttl_s it is still served, while a refresh runs in the
+    background (stale-while-revalidate). Caching is off by default.
+    """
 
     def __init__(
         self,
         gps_collector: GPSCollector,
         traffic_collector: TrafficCollector,
-        load_collector: LoadCollector
+        load_collector: LoadCollector,
+        caching_ttl_s: float = 0.0,
+        caching_swr_ttl_s: float = 0.0,
     ):
         self.gps_collector = gps_collector
         self.traffic_collector = traffic_collector
         self.load_collector = load_collector
+        self.caching_ttl_s = caching_ttl_s
+        self.caching_swr_ttl_s = caching_swr_ttl_s
+        self._cached_result: Optional[dict[str, Any]] = None
+        self._cached_key: Optional[tuple] = None
+        self._cached_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
 
     async def collect_all(self) -> dict[str, Any]:
         """Collect data from all sources concurrently."""
+        if self.caching_ttl_s <= 0:
+            return await self._collect_all()
+
+        key = tuple((t.id, t.status) for t in self.gps_collector.trucks)
+        if self._cached_result is not None and key == self._cached_key:
+            age = time.monotonic() - self._cached_at
+            if age < self.caching_ttl_s:
+                return self._cached_result
+            if age < self.caching_ttl_s + self.caching_swr_ttl_s:
+                if self._refresh_task is None or self._refresh_task.done():
+                    self._refresh_task = asyncio.create_task(self._refresh(key))
+                return self._cached_result
+
+        return await self._refresh(key)
+
+    async def _refresh(self, key: tuple) -> dict[str, Any]:
+        """Collect a fresh result and cache it for the given fleet."""
+        result = await self._collect_all()
+        self._cached_result = result
+        self._cached_key = key
+        self._cached_at = time.monotonic()
+        return result
+
+    async def _collect_all(self) -> dict[str, Any]:
+        """Run every collector once and combine their results."""
         # Run all collectors in parallel
         gps_task = asyncio.create_task(self.gps_collector.collect())
         traffic_task = asyncio.create_task(self.traffic_collector.collect())
@@ -6,12 +6,15 @@ This node is the entry point of the control loop, responsible for:
 - Preprocessing and validating data
 - Updating the agent state with observations
 """
-from datetime import datetime
+import asyncio
+import weakref
 from typing import Any, Callable
 import structlog
 
 from src.models import (
-    AgentState, ControlLoopPhase, Truck, Route, TruckStatus, Location
+    AgentState, ControlLoopPhase, Truck, TruckStatus, Location,
+    TRUCK_LIST_ADAPTER, ROUTE_LIST_ADAPTER, GPS_READING_LIST_ADAPTER, TRAFFIC_LIST_ADAPTER,
+    LOAD_LIST_ADAPTER,
 )
 from src.perception.collectors import (
     GPSCollector, TrafficCollector, LoadCollector, AggregatedCollector
@@ -26,6 +29,8 @@ def create_observation_node(
     traffic_collector: TrafficCollector = None,
     load_collector: LoadCollector = None,
     preprocessor: DataPreprocessor = None,
+    caching_ttl_s: float = 0.0,
+    caching_swr_ttl_s: float = 0.0,
 ) -> Callable[[AgentState], AgentState]:
     """
     Create an observation node for the LangGraph control loop.
@@ -35,6 +40,8 @@ def create_observation_node(
         traffic_collector: Traffic data collector (optional)
         load_collector: Load data collector (optional)
         preprocessor: Data preprocessor (optional)
+        caching_ttl_s: Seconds a collection is reused for an unchanged fleet (0 disables)
+        caching_swr_ttl_s: Further seconds a stale collection is served while refreshing
 
     Returns:
         A function that can be used as a LangGraph node
@@ -44,6 +51,10 @@ def create_observation_node(
     _traffic_collector = traffic_collector or TrafficCollector(simulate=True)
     _load_collector = load_collector or LoadCollector(simulate=True)
     _preprocessor = preprocessor or DataPreprocessor()
+    _aggregated = AggregatedCollector(
+        _gps_collector, _traffic_collector, _load_collector,
+        caching_ttl_s=caching_ttl_s, caching_swr_ttl_s=caching_swr_ttl_s,
+    )
 
     async def observation_node(state: AgentState) -> AgentState:
         """
@@ -66,27 +77,19 @@ def create_observation_node(
 
         try:
             # Reconstruct trucks from state
-            trucks = [
-                Truck(**t) for t in state.get("trucks", [])
-            ]
+            state_trucks = state.get("trucks", [])
+            trucks = TRUCK_LIST_ADAPTER.validate_python(state_trucks)
 
             # Update collector with current trucks
             _gps_collector.set_trucks(trucks)
 
             # Reconstruct routes for traffic correlation
-            routes = [
-                Route(**r) for r in state.get("routes", [])
-            ]
+            routes = ROUTE_LIST_ADAPTER.validate_python(state.get("routes", []))
 
             # Collect all data concurrently
-            aggregated = AggregatedCollector(
-                _gps_collector, _traffic_collector, _load_collector
-            )
-
-            import asyncio
-            collection_result = await aggregated.collect_all()
+            collection_result = await _aggregated.collect_all()
 
-            # Preprocess GPS readings
+            # Preprocess GPS readings; trucks are updated in place
             gps_readings, updated_trucks = _preprocessor.preprocess_gps_readings(
                 collection_result["gps_readings"],
                 trucks
@@ -106,15 +109,33 @@ def create_observation_node(
             # Get preprocessing summary
             preprocessing_summary = _preprocessor.get_preprocessing_summary()
 
+            # A truck only changes where a reading was applied to it (location,
+            # last reading and inferred status), so the state's truck dicts are
+            # patched with the dumped readings instead of re-dumping every truck
+            gps_dump = GPS_READING_LIST_ADAPTER.dump_python(gps_readings)
+            latest_readings = {r["truck_id"]: r for r in gps_dump}
+            truck_dicts = []
+            for truck_dict, truck in zip(state_trucks, trucks):
+                reading = latest_readings.get(truck.id)
+                if reading is not None:
+                    truck_dict = {
+                        **truck_dict,
+                        "current_location": reading["location"],
+                        "last_gps_reading": reading,
+                        "status": truck.status,
+                    }
+                truck_dicts.append(truck_dict)
+
             # Update state
             updated_state: AgentState = {
-                **state,
                 "current_phase": ControlLoopPhase.OBSERVE,
-                "observation_timestamp": datetime.utcnow().isoformat(),
-                "trucks": [t.model_dump() for t in updated_trucks],
-                "gps_readings": [r.model_dump() for r in gps_readings],
-                "traffic_conditions": [tc.model_dump() for tc in traffic_conditions],
-                "loads": [l.model_dump() for l in loads],
+                # The collection already stamped itself; with caching this is
+                # the time the data was actually gathered
+                "observation_timestamp": collection_result["timestamp"],
+                "trucks": truck_dicts,
+                "gps_readings": gps_dump,
+                "traffic_conditions": TRAFFIC_LIST_ADAPTER.dump_python(traffic_conditions),
+                "loads": LOAD_LIST_ADAPTER.dump_python(loads),
                 "error_message": None,
             }
 
@@ -145,23 +166,26 @@ def create_observation_node(
                 error=str(e)
             )
             return {
-                **state,
                 "current_phase": ControlLoopPhase.OBSERVE,
                 "error_message": f"Observation failed: {str(e)}",
                 "continue_loop": False,
             }
 
+    # One event loop serves every cycle of this node. It is started here so
+    # the context it copies is the creator's, not that of the graph run
+    # that happens to call the node first
+    _runner = asyncio.Runner()
+    _runner.get_loop()
+
     # Return sync wrapper for LangGraph compatibility
     def sync_observation_node(state: AgentState) -> AgentState:
         """Synchronous wrapper for the observation node."""
-        import asyncio
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        return _runner.run(observation_node(state))
 
-        return loop.run_until_complete(observation_node(state))
+    # Owners of the node close its loop when done with it; otherwise it is
+    # closed once the node is released, or at exit
+    sync_observation_node.close = _runner.close
+    weakref.finalize(sync_observation_node, _runner.close)
 
     return sync_observation_node
 
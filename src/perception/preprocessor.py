@@ -4,17 +4,29 @@ Data preprocessor for the perception layer.
 Validates, cleans, and transforms raw data into normalized formats
 ready for the reasoning layer.
 """
+from collections import deque
 from datetime import datetime, timedelta
+from itertools import islice
 from typing import Any, Optional
+import numpy as np
 import structlog
 
 from src.models import (
     GPSReading, Location, Truck, TruckStatus,
-    TrafficCondition, TrafficLevel, Load, Route
+    TrafficCondition, TrafficLevel, Load, Route,
+    build_location_matrix, haversine_pairs,
 )
 
 logger = structlog.get_logger(__name__)
 
+# Validation errors and anomalies kept for the summary; older ones drop out
+MAX_RECORDED_EVENTS = 1000
+
+
+def _tail(events: deque, n: int) -> list:
+    """The last n events, oldest first."""
+    return list(islice(events, max(0, len(events) - n), None))
+
 
 class DataPreprocessor:
     """
@@ -29,10 +41,13 @@ class DataPreprocessor:
     """
 
     def __init__(self):
-        self.validation_errors: list[dict] = []
-        self.anomalies_detected: list[dict] = []
-        self._gps_history: dict[str, list[GPSReading]] = {}
+        self.validation_errors: deque[dict] = deque(maxlen=MAX_RECORDED_EVENTS)
+        self.anomalies_detected: deque[dict] = deque(maxlen=MAX_RECORDED_EVENTS)
         self._max_history_length = 100
+        # Bounded per truck; the oldest reading drops out on append
+        self._gps_history: dict[str, deque[GPSReading]] = {}
+        # Consecutive readings below 5 km/h per truck, ending at the latest one
+        self._slow_streak: dict[str, int] = {}
 
     def preprocess_gps_readings(
         self,
@@ -47,52 +62,63 @@ class DataPreprocessor:
             trucks: Current truck states
 
         Returns:
-            Tuple of (validated readings, updated trucks)
+            Tuple of (validated readings, the trucks list updated in place)
         """
         validated_readings = []
+        # Lookup view only; the trucks themselves are updated in place
         truck_map = {t.id: t for t in trucks}
-
-        for reading in readings:
-            # Validate reading
-            if not self._validate_gps_reading(reading):
+        # One clock read for the whole batch
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        future_limit = now + timedelta(minutes=5)
+
+        valid = self._validate_gps_batch(readings, future_limit)
+        previous: list[GPSReading] = []
+        current: list[GPSReading] = []
+
+        for reading, ok in zip(readings, valid):
+            # Rejected readings go back through the scalar check, which
+            # records why they failed
+            if not ok:
+                self._validate_gps_reading(reading, future_limit, now_iso)
                 continue
 
-            # Check for anomalies
-            if reading.truck_id in self._gps_history:
-                self._detect_gps_anomalies(reading)
-
-            # Store in history
-            if reading.truck_id not in self._gps_history:
-                self._gps_history[reading.truck_id] = []
-            self._gps_history[reading.truck_id].append(reading)
-            if len(self._gps_history[reading.truck_id]) > self._max_history_length:
-                self._gps_history[reading.truck_id].pop(0)
+            # Store in history, pairing the reading with the truck's previous
+            # one for anomaly detection
+            history = self._gps_history.get(reading.truck_id)
+            if history is None:
+                history = self._gps_history[reading.truck_id] = deque(maxlen=self._max_history_length)
+            elif history:
+                previous.append(history[-1])
+                current.append(reading)
+            history.append(reading)
+            streak = self._slow_streak[reading.truck_id] = (
+                self._slow_streak.get(reading.truck_id, 0) + 1 if reading.speed_kmh < 5 else 0
+            )
 
             validated_readings.append(reading)
 
             # Update truck with latest reading
-            if reading.truck_id in truck_map:
-                truck = truck_map[reading.truck_id]
+            truck = truck_map.get(reading.truck_id)
+            if truck is not None:
                 truck.current_location = reading.location
                 truck.last_gps_reading = reading
 
                 # Infer status from speed if en_route
                 if truck.status == TruckStatus.EN_ROUTE:
-                    if reading.speed_kmh < 5:
-                        # Possibly stuck
-                        history = self._gps_history.get(reading.truck_id, [])
-                        if len(history) >= 5:
-                            recent_speeds = [r.speed_kmh for r in history[-5:]]
-                            if all(s < 5 for s in recent_speeds):
-                                truck.status = TruckStatus.STUCK
-                                self.anomalies_detected.append({
-                                    "type": "truck_stuck",
-                                    "truck_id": reading.truck_id,
-                                    "timestamp": datetime.utcnow().isoformat(),
-                                    "details": "Truck stationary for extended period"
-                                })
-
-        updated_trucks = list(truck_map.values())
+                    # Possibly stuck: the last five readings were all slow
+                    if streak >= 5:
+                        truck.status = TruckStatus.STUCK
+                        self.anomalies_detected.append({
+                            "type": "truck_stuck",
+                            "truck_id": reading.truck_id,
+                            "timestamp": now_iso,
+                            "details": "Truck stationary for extended period"
+                        })
+
+        # Check for anomalies
+        self._detect_gps_anomalies(previous, current, now_iso)
+
         logger.info(
             "GPS readings preprocessed",
             total=len(readings),
@@ -100,10 +126,26 @@ class DataPreprocessor:
             errors=len(self.validation_errors)
         )
 
-        return validated_readings, updated_trucks
+        return validated_readings, trucks
+
+    def _validate_gps_batch(self, readings: list[GPSReading], future_limit: datetime) -> list[bool]:
+        """Apply the checks of _validate_gps_reading to every reading at once."""
+        n = len(readings)
+        lat = np.fromiter((r.location.latitude for r in readings), dtype=np.float64, count=n)
+        lon = np.fromiter((r.location.longitude for r in readings), dtype=np.float64, count=n)
+        speed = np.fromiter((r.speed_kmh for r in readings), dtype=np.float64, count=n)
+        ts = np.array([r.timestamp for r in readings], dtype="datetime64[us]")
+
+        mask = (
+            (lat >= -90) & (lat <= 90)
+            & (lon >= -180) & (lon <= 180)
+            & (speed >= 0) & (speed <= 200)
+            & (ts <= np.datetime64(future_limit, "us"))
+        )
+        return mask.tolist()
 
-    def _validate_gps_reading(self, reading: GPSReading) -> bool:
-        """Validate a single GPS reading."""
+    def _validate_gps_reading(self, reading: GPSReading, future_limit: datetime, now_iso: str) -> bool:
+        """Validate a single GPS reading; timestamps past future_limit are rejected."""
         errors = []
 
         # Check coordinates
@@ -119,52 +161,72 @@ class DataPreprocessor:
             errors.append(f"Unrealistic speed: {reading.speed_kmh}")
 
         # Check timestamp
-        if reading.timestamp > datetime.utcnow() + timedelta(minutes=5):
+        if reading.timestamp > future_limit:
             errors.append("Future timestamp detected")
 
         if errors:
             self.validation_errors.append({
                 "truck_id": reading.truck_id,
                 "errors": errors,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             })
             return False
 
         return True
 
-    def _detect_gps_anomalies(self, reading: GPSReading) -> None:
-        """Detect anomalies in GPS data by comparing with history."""
-        history = self._gps_history.get(reading.truck_id, [])
-        if not history:
+    def _detect_gps_anomalies(
+        self, previous: list[GPSReading], current: list[GPSReading], now_iso: str
+    ) -> None:
+        """Detect anomalies by comparing each reading with the truck's previous one."""
+        n = len(current)
+        if not n:
             return
 
-        last_reading = history[-1]
+        time_diff = (
+            np.array([r.timestamp for r in current], dtype="datetime64[us]")
+            - np.array([r.timestamp for r in previous], dtype="datetime64[us]")
+        ) / np.timedelta64(1, "s")
+        distance = haversine_pairs(
+            build_location_matrix([r.location for r in previous]),
+            build_location_matrix([r.location for r in current]),
+        )
+        speed_change = np.abs(
+            np.fromiter((r.speed_kmh for r in current), dtype=np.float64, count=n)
+            - np.fromiter((r.speed_kmh for r in previous), dtype=np.float64, count=n)
+        )
 
         # Check for teleportation (impossible distance in time)
-        time_diff = (reading.timestamp - last_reading.timestamp).total_seconds()
-        if time_diff > 0:
-            distance = last_reading.location.distance_to(reading.location)
-            implied_speed = (distance / time_diff) * 3600  # km/h
+        moved = time_diff > 0
+        implied_speed = np.zeros(n)
+        implied_speed[moved] = distance[moved] / time_diff[moved] * 3600  # km/h
+        teleported = implied_speed > 200  # Impossible speed
+
+        # Check for sudden speed changes
+        jumped = (speed_change > 50) & (time_diff < 5)  # 50 km/h change in <5 seconds
+
+        flagged = np.flatnonzero(teleported | jumped).tolist()
+        if not flagged:
+            return
 
-            if implied_speed > 200:  # Impossible speed
+        for i in flagged:
+            truck_id = current[i].truck_id
+            seconds = time_diff[i].item()
+            if teleported[i]:
                 self.anomalies_detected.append({
                     "type": "teleportation",
-                    "truck_id": reading.truck_id,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "details": f"Implied speed {implied_speed:.0f} km/h",
-                    "distance_km": distance,
-                    "time_seconds": time_diff
+                    "truck_id": truck_id,
+                    "timestamp": now_iso,
+                    "details": f"Implied speed {implied_speed[i]:.0f} km/h",
+                    "distance_km": distance[i].item(),
+                    "time_seconds": seconds
+                })
+            if jumped[i]:
+                self.anomalies_detected.append({
+                    "type": "sudden_speed_change",
+                    "truck_id": truck_id,
+                    "timestamp": now_iso,
+                    "details": f"Speed change of {speed_change[i]:.0f} km/h in {seconds:.1f}s"
                 })
-
-        # Check for sudden speed changes
-        speed_change = abs(reading.speed_kmh - last_reading.speed_kmh)
-        if speed_change > 50 and time_diff < 5:  # 50 km/h change in <5 seconds
-            self.anomalies_detected.append({
-                "type": "sudden_speed_change",
-                "truck_id": reading.truck_id,
-                "timestamp": datetime.utcnow().isoformat(),
-                "details": f"Speed change of {speed_change:.0f} km/h in {time_diff:.1f}s"
-            })
 
     def preprocess_traffic_conditions(
         self,
@@ -182,35 +244,45 @@ class DataPreprocessor:
             Validated and enriched traffic conditions
         """
         validated_conditions = []
-        route_segments = self._extract_route_segments(routes)
+        # Invert the route -> segments mapping once, so each condition
+        # finds its routes with one lookup
+        segment_routes: dict[str, list[str]] = {}
+        for route_id, segments in self._extract_route_segments(routes).items():
+            for segment_id in dict.fromkeys(segments):
+                segment_routes.setdefault(segment_id, []).append(route_id)
+        now_iso = datetime.utcnow().isoformat()
+        standstill_segments = []
+        with_incidents = 0
 
         for condition in conditions:
             # Validate condition
-            if not self._validate_traffic_condition(condition):
+            if not self._validate_traffic_condition(condition, now_iso):
                 continue
 
             # Link to affected routes
-            affected = []
-            for route in routes:
-                if condition.segment_id in route_segments.get(route.id, []):
-                    affected.append(route.id)
-            condition.affected_routes = affected
+            condition.affected_routes = list(segment_routes.get(condition.segment_id, ()))
+
+            # Tally what the anomaly check and the log need in the same pass
+            if condition.level == TrafficLevel.STANDSTILL:
+                standstill_segments.append(condition.segment_id)
+            if condition.incident_description:
+                with_incidents += 1
 
             validated_conditions.append(condition)
 
         # Detect traffic anomalies
-        self._detect_traffic_anomalies(validated_conditions)
+        self._detect_traffic_anomalies(standstill_segments, now_iso)
 
         logger.info(
             "Traffic conditions preprocessed",
             total=len(conditions),
             validated=len(validated_conditions),
-            with_incidents=sum(1 for c in validated_conditions if c.incident_description)
+            with_incidents=with_incidents
         )
 
         return validated_conditions
 
-    def _validate_traffic_condition(self, condition: TrafficCondition) -> bool:
+    def _validate_traffic_condition(self, condition: TrafficCondition, now_iso: str) -> bool:
         """Validate a traffic condition."""
         errors = []
 
@@ -224,7 +296,7 @@ class DataPreprocessor:
             self.validation_errors.append({
                 "segment_id": condition.segment_id,
                 "errors": errors,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             })
             return False
 
@@ -236,21 +308,16 @@ class DataPreprocessor:
         # For now, return empty mapping
         return {}
 
-    def _detect_traffic_anomalies(self, conditions: list[TrafficCondition]) -> None:
-        """Detect anomalies in traffic data."""
+    def _detect_traffic_anomalies(self, standstill_segments: list[str], now_iso: str) -> None:
+        """Detect anomalies in traffic data, given the validated segments at standstill."""
         # Check for multiple standstill conditions (possible major incident)
-        standstill_count = sum(
-            1 for c in conditions if c.level == TrafficLevel.STANDSTILL
-        )
+        standstill_count = len(standstill_segments)
         if standstill_count >= 3:
             self.anomalies_detected.append({
                 "type": "major_traffic_event",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": now_iso,
                 "details": f"{standstill_count} segments at standstill",
-                "affected_segments": [
-                    c.segment_id for c in conditions
-                    if c.level == TrafficLevel.STANDSTILL
-                ]
+                "affected_segments": standstill_segments
             })
 
     def preprocess_loads(self, loads: list[Load]) -> list[Load]:
@@ -264,22 +331,25 @@ class DataPreprocessor:
             Validated and enriched loads
         """
         validated_loads = []
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        # Deadlines before this are under an hour away
+        imminent_cutoff = now + timedelta(hours=1)
 
         for load in loads:
-            if not self._validate_load(load):
+            if not self._validate_load(load, now_iso):
                 continue
 
             # Check for deadline issues
-            if load.delivery_deadline:
-                time_to_deadline = (load.delivery_deadline - datetime.utcnow()).total_seconds() / 3600
-                if time_to_deadline < 1:
-                    self.anomalies_detected.append({
-                        "type": "imminent_deadline",
-                        "load_id": load.id,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "details": f"Deadline in {time_to_deadline:.1f} hours",
-                        "priority": load.priority.value
-                    })
+            if load.delivery_deadline and load.delivery_deadline < imminent_cutoff:
+                time_to_deadline = (load.delivery_deadline - now).total_seconds() / 3600
+                self.anomalies_detected.append({
+                    "type": "imminent_deadline",
+                    "load_id": load.id,
+                    "timestamp": now_iso,
+                    "details": f"Deadline in {time_to_deadline:.1f} hours",
+                    "priority": load.priority.value
+                })
 
             validated_loads.append(load)
 
@@ -291,7 +361,7 @@ class DataPreprocessor:
 
         return validated_loads
 
-    def _validate_load(self, load: Load) -> bool:
+    def _validate_load(self, load: Load, now_iso: str) -> bool:
         """Validate a load."""
         errors = []
 
@@ -305,7 +375,7 @@ class DataPreprocessor:
             self.validation_errors.append({
                 "load_id": load.id,
                 "errors": errors,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": now_iso
             })
             return False
 
@@ -317,12 +387,13 @@ class DataPreprocessor:
             "timestamp": datetime.utcnow().isoformat(),
             "validation_errors": len(self.validation_errors),
             "anomalies_detected": len(self.anomalies_detected),
-            "recent_errors": self.validation_errors[-10:],
-            "recent_anomalies": self.anomalies_detected[-10:],
+            "recent_errors": _tail(self.validation_errors, 10),
+            "recent_anomalies": _tail(self.anomalies_detected, 10),
         }
 
     def clear_history(self) -> None:
         """Clear preprocessing history and caches."""
         self._gps_history.clear()
+        self._slow_streak.clear()
         self.validation_errors.clear()
         self.anomalies_detected.clear()
@@ -7,8 +7,8 @@ from typing import Callable
 import structlog
 
 from src.models import (
-    AgentState, ControlLoopPhase, Truck, Load,
-    TrafficCondition, Issue, PlanningResult
+    AgentState, ControlLoopPhase, Issue, PlanningResult,
+    TRUCK_LIST_ADAPTER, LOAD_LIST_ADAPTER, TRAFFIC_LIST_ADAPTER,
 )
 from src.planning.simulation_engine import SimulationEngine
 from src.planning.scenario_generator import ScenarioGenerator
@@ -53,14 +53,22 @@ def create_planning_node(
         )
 
         try:
-            # Extract data from state
-            trucks = [Truck(**t) for t in state.get("trucks", [])]
-            loads = [Load(**l) for l in state.get("loads", [])]
-            traffic = [TrafficCondition(**tc) for tc in state.get("traffic_conditions", [])]
-            issues = [Issue(**i) for i in state.get("current_issues", [])]
+            # Issues are flat and were dumped from validated models by the
+            # reasoning node, so they are rebuilt without validation
+            issues = [Issue.model_construct(**i) for i in state.get("current_issues", [])]
+
+            # The fleet is only needed to plan for issues. Trucks, loads and
+            # traffic hold nested models, so they go through the list
+            # validators rather than model_construct
+            if issues:
+                trucks = TRUCK_LIST_ADAPTER.validate_python(state.get("trucks", []))
+                loads = LOAD_LIST_ADAPTER.validate_python(state.get("loads", []))
+                traffic = TRAFFIC_LIST_ADAPTER.validate_python(state.get("traffic_conditions", []))
 
             all_scenarios = []
-            planning_results = []
+            combined_comparison = {}
+            overall_recommended = None
+            best_overall = None
 
             # Generate scenarios for each issue
             for issue in issues:
@@ -75,35 +83,17 @@ def create_planning_node(
                     # Compare scenarios
                     comparison = _sim_engine.compare_scenarios(scenarios)
 
-                    # Find recommended scenario
-                    recommended_id = None
-                    best_score = 0
-                    for sid, scores in comparison.items():
-                        if scores['overall'] > best_score:
-                            best_score = scores['overall']
-                            recommended_id = sid
-
-                    planning_result = PlanningResult(
-                        issue_id=issue.id,
-                        scenarios=scenarios,
-                        comparison_matrix=comparison,
-                        recommended_scenario_id=recommended_id,
+                    # The issue's recommended scenario also competes for
+                    # the overall recommendation
+                    recommended_id, recommended_scores = max(
+                        comparison.items(), key=lambda item: item[1]['overall']
                     )
-                    planning_results.append(planning_result)
-                    all_scenarios.extend(scenarios)
-
-            # Combine all planning results
-            combined_comparison = {}
-            for pr in planning_results:
-                combined_comparison.update(pr.comparison_matrix)
+                    if best_overall is None or recommended_scores['overall'] > best_overall:
+                        best_overall = recommended_scores['overall']
+                        overall_recommended = recommended_id
 
-            # Find overall recommended scenario
-            overall_recommended = None
-            best_overall = 0
-            for sid, scores in combined_comparison.items():
-                if scores['overall'] > best_overall:
-                    best_overall = scores['overall']
-                    overall_recommended = sid
+                    combined_comparison.update(comparison)
+                    all_scenarios.extend(scenarios)
 
             final_planning_result = PlanningResult(
                 issue_id=issues[0].id if issues else None,
@@ -112,12 +102,17 @@ def create_planning_node(
                 recommended_scenario_id=overall_recommended,
             )
 
+            # Each scenario is dumped once and the list is shared by the
+            # planning result and the state's scenarios
+            scenario_dicts = [s.model_dump() for s in all_scenarios]
+            planning_dict = final_planning_result.model_dump(exclude={"scenarios"})
+            planning_dict["scenarios"] = scenario_dicts
+
             # Update state
             updated_state: AgentState = {
-                **state,
                 "current_phase": ControlLoopPhase.PLAN,
-                "planning_result": final_planning_result.model_dump(),
-                "scenarios": [s.model_dump() for s in all_scenarios],
+                "planning_result": planning_dict,
+                "scenarios": scenario_dicts,
             }
 
             logger.info(
@@ -138,7 +133,6 @@ def create_planning_node(
 
             # Return state with error
             return {
-                **state,
                 "current_phase": ControlLoopPhase.PLAN,
                 "planning_result": PlanningResult(
                     scenarios=[],
@@ -15,6 +15,9 @@ from src.planning.simulation_engine import SimulationEngine
 
 logger = structlog.get_logger(__name__)
 
+# Trucks that can take over a load
+AVAILABLE_STATUSES = frozenset({TruckStatus.IDLE, TruckStatus.EN_ROUTE})
+
 
 class ScenarioGenerator:
     """
@@ -186,7 +189,7 @@ class ScenarioGenerator:
         available_trucks = [
             t for t in trucks
             if t.id != (truck.id if truck else None)
-            and t.status in [TruckStatus.IDLE, TruckStatus.EN_ROUTE]
+            and t.status in AVAILABLE_STATUSES
         ]
 
         if available_trucks and load and truck:
@@ -11,6 +11,7 @@ import json
 import asyncio
 from typing import Any, Optional
 from datetime import datetime
+import orjson
 import structlog
 from tenacity import (
     retry,
@@ -289,7 +290,7 @@ class GroqClient:
             elif "```" in content:
                 content = content.split("```")[1].split("```")[0]
 
-            parsed = json.loads(content)
+            parsed = orjson.loads(content)
 
             # Validate against schema if provided
             if schema:
@@ -303,7 +304,7 @@ class GroqClient:
                 "parsed": parsed,
             }
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.warning("Failed to parse JSON response", error=str(e))
             return {
                 **response,
@@ -6,6 +6,7 @@ This node analyzes fleet data using Grok LLM to:
 - Assess risks
 - Generate recommendations
 """
+import itertools
 import json
 import uuid
 from datetime import datetime
@@ -20,6 +21,11 @@ from src.reasoning.prompts import PromptTemplates
 
 logger = structlog.get_logger(__name__)
 
+# Issue IDs are a random per-process prefix plus a counter, so they stay
+# distinct across workers and restarts without drawing random bytes per issue
+_ISSUE_ID_PREFIX = uuid.uuid4().hex[:8].upper()
+_ISSUE_IDS = itertools.count()
+
 
 def create_reasoning_node(
     groq_client: GroqClient = None,
@@ -91,7 +97,6 @@ def create_reasoning_node(
 
             # Update state
             updated_state: AgentState = {
-                **state,
                 "current_phase": ControlLoopPhase.REASON,
                 "reasoning_result": reasoning_result.model_dump(),
                 "current_issues": [i.model_dump() for i in reasoning_result.issues],
@@ -124,7 +129,6 @@ def create_reasoning_node(
             )
 
             return {
-                **state,
                 "current_phase": ControlLoopPhase.REASON,
                 "reasoning_result": fallback_result.model_dump(),
                 "current_issues": [],
@@ -166,7 +170,7 @@ def _analyze_situation(
     issues = []
     for issue_data in parsed.get("issues", []):
         issue = Issue(
-            id=issue_data.get("id", f"ISSUE-{uuid.uuid4().hex[:8].upper()}"),
+            id=issue_data.get("id") or f"ISSUE-{_ISSUE_ID_PREFIX}-{next(_ISSUE_IDS):06X}",
             type=issue_data.get("type", "unknown"),
             severity=issue_data.get("severity", "medium"),
             description=issue_data.get("description", ""),
@@ -222,7 +226,7 @@ def _analyze_truck(
         if parsed.get("has_issues"):
             for issue_data in parsed.get("issues", []):
                 issue = Issue(
-                    id=f"ISSUE-{truck.get('id')}-{uuid.uuid4().hex[:6].upper()}",
+                    id=f"ISSUE-{truck.get('id')}-{_ISSUE_ID_PREFIX}-{next(_ISSUE_IDS):06X}",
                     type=issue_data.get("type", "unknown"),
                     severity=issue_data.get("severity", "medium"),
                     description=issue_data.get("description", ""),
@@ -283,7 +287,7 @@ def _create_fallback_situation_analysis(
     heavy_segments = [tc for tc in traffic if tc.get("level") in ["heavy", "standstill"]]
     if len(heavy_segments) > 2:
         issues.append(Issue(
-            id=f"ISSUE-TRAFFIC-{uuid.uuid4().hex[:6].upper()}",
+            id=f"ISSUE-TRAFFIC-{_ISSUE_ID_PREFIX}-{next(_ISSUE_IDS):06X}",
             type="traffic",
             severity="medium",
             description=f"Heavy traffic on {len(heavy_segments)} segments",
@@ -294,7 +298,7 @@ def _create_fallback_situation_analysis(
     unassigned_urgent = [l for l in urgent_loads if not l.get("assigned_truck_id")]
     if unassigned_urgent:
         issues.append(Issue(
-            id=f"ISSUE-LOAD-{uuid.uuid4().hex[:6].upper()}",
+            id=f"ISSUE-LOAD-{_ISSUE_ID_PREFIX}-{next(_ISSUE_IDS):06X}",
             type="capacity_mismatch",
             severity="high",
             description=f"{len(unassigned_urgent)} urgent loads without assigned trucks",
@@ -45,6 +45,6 @@ echo Starting API server on http://localhost:8000
 echo Press Ctrl+C to stop
 echo.
 
-python -m uvicorn src.api.main:app --reload --port 8000
+python -m uvicorn src.api.main:app --reload --port 8000 --ws-per-message-deflate false
 
 pause
\ No newline at end of file
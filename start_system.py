@@ -56,7 +56,8 @@ def start_api_server():
         'src.api.main:app', 
         '--reload', 
         '--host', '0.0.0.0', 
-        '--port', '8000'
+        '--port', '8000',
+        '--ws-per-message-deflate', 'false'
     ])
     
     return api_process
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Test script for delivery request persistence and batch processing.
+
+Runs against a throwaway SQLite database; no server needs to be running.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+# The store path is read when the modules are imported, so point it at a
+# temporary database first
+TEMP_DIR = tempfile.mkdtemp(prefix="logistics-requests-")
+os.environ["REQUESTS_DB_PATH"] = os.path.join(TEMP_DIR, "requests.db")
+
+REQUEST_DATA = {
+    "customer_name": "Store Test Customer",
+    "customer_phone": "+1555123456",
+    "description": "Test package for store verification",
+    "weight_kg": 8.5,
+    "priority": "normal",
+    "pickup_address": "100 Test Street, New York, NY",
+    "delivery_address": "200 Demo Avenue, Brooklyn, NY",
+}
+
+
+async def test_store_round_trip():
+    """Test that requests survive a restart and interrupted ones are reset."""
+    print("🧪 Testing request store round-trip...")
+
+    try:
+        from src.models import RequestStatus
+        from src.api.services.request_processor import RequestProcessor
+        from src.api.services.request_store import AIOSQLITE_AVAILABLE, RequestStore
+
+        if not AIOSQLITE_AVAILABLE:
+            print("⚠️  aiosqlite not installed, requests are kept in memory only")
+            return False
+
+        processor = RequestProcessor()
+        await processor.open()
+        request = await processor.submit_request(REQUEST_DATA)
+        await processor.aclose()
+        print(f"✅ Request saved: {request.id}")
+
+        # Leave it mid-processing in the database, as a crash would
+        request.status = RequestStatus.PROCESSING
+        store = RequestStore()
+        await store.open()
+        await store.save_many([request])
+        await store.close()
+
+        # A fresh processor reloads it from the database
+        reloaded = RequestProcessor()
+        await reloaded.open()
+        try:
+            restored = reloaded.get_request(request.id)
+            if not restored or restored.customer_name != REQUEST_DATA["customer_name"]:
+                print("❌ Request was not reloaded from the store")
+                return False
+            print(f"✅ Request reloaded: {restored.id}")
+
+            if restored.status != RequestStatus.PENDING:
+                print(f"❌ Interrupted request not reset: {restored.status}")
+                return False
+            print("✅ Interrupted request reset to pending")
+        finally:
+            await reloaded.aclose()
+
+        # The reset is written back, not just applied in memory
+        check = RequestProcessor()
+        await check.open()
+        try:
+            if check.get_request(request.id).status != RequestStatus.PENDING:
+                print("❌ Reset status was not persisted")
+                return False
+            print("✅ Reset status persisted")
+        finally:
+            await check.aclose()
+
+        return True
+    except Exception as e:
+        print(f"❌ Store round-trip failed: {e}")
+        return False
+
+
+async def test_process_batch():
+    """Test pushing a small batch through PUT /api/requests/process-batch."""
+    print("\n🧪 Testing batch processing...")
+
+    try:
+        import httpx
+        from fastapi import FastAPI
+        from src.models import RequestStatus
+        from src.api.routes.requests import router
+        from src.api.services.request_processor import RequestProcessor, request_processor
+        from src.api.services.state_manager import state_manager
+        from src.perception.observation_node import create_sample_fleet
+
+        state_manager.set_trucks(create_sample_fleet())
+
+        app = FastAPI()
+        app.include_router(router)
+
+        await request_processor.open()
+        try:
+            request_ids = [
+                (await request_processor.submit_request(
+                    {**REQUEST_DATA, "customer_name": f"Batch Customer {i}"}
+                )).id
+                for i in range(3)
+            ]
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.put(
+                    "/api/requests/process-batch",
+                    json={"request_ids": request_ids}
+                )
+
+            if response.status_code != 200:
+                print(f"❌ Batch not accepted: {response.status_code}")
+                print(f"   Error: {response.text}")
+                return False
+            print(f"✅ Batch accepted: {len(request_ids)} requests")
+
+            # Wait for the worker pool to finish the batch
+            for _ in range(100):
+                statuses = [request_processor.get_request(i).status for i in request_ids]
+                if RequestStatus.PROCESSING not in statuses:
+                    break
+                await asyncio.sleep(0.1)
+
+            for request_id, status in zip(request_ids, statuses):
+                print(f"   - {request_id}: {status.value}")
+
+            if any(status != RequestStatus.ASSIGNED for status in statuses):
+                print("❌ Not every request in the batch was assigned")
+                return False
+            print("✅ Every request in the batch was assigned")
+        finally:
+            await request_processor.aclose()
+
+        # The batch results are written through to the store
+        check = RequestProcessor()
+        await check.open()
+        try:
+            if any(check.get_request(i).status != RequestStatus.ASSIGNED for i in request_ids):
+                print("❌ Batch results were not persisted")
+                return False
+            print("✅ Batch results persisted")
+        finally:
+            await check.aclose()
+
+        return True
+    except Exception as e:
+        print(f"❌ Batch processing failed: {e}")
+        return False
+
+
+async def main():
+    """Run all tests."""
+    print("🚀 REQUEST STORE TEST")
+    print("="*60)
+
+    tests = [
+        ("Store Round-Trip", test_store_round_trip),
+        ("Process Batch", test_process_batch),
+    ]
+
+    results = []
+
+    try:
+        for test_name, test_func in tests:
+            results.append((test_name, await test_func()))
+    finally:
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    # Print results
+    print("\n" + "="*60)
+    print(" TEST RESULTS")
+    print("="*60)
+
+    passed = 0
+    for test_name, result in results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{test_name:20} {status}")
+        if result:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(tests)} tests passed")
+
+    return passed == len(tests)
+
+if __name__ == "__main__":
+    success = asyncio.run(main())
+    sys.exit(0 if success else 1)